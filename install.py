@@ -5,15 +5,43 @@
 """
 
 import os
+import stat
 import sys
-import subprocess
-import shutil
-from pathlib import Path
+import importlib.util
 
 
-def print_header():
-    """Красивый заголовок"""
-    logo = r"""
+# Эмодзи и псевдографика только для UTF-8 консолей: в остальных (cmd.exe,
+# часть CI) они медленно перекодируются или не выводятся вовсе
+_FANCY = (sys.stdout.encoding or "").lower().startswith("utf")
+
+
+def _sym(fancy, plain):
+    return fancy if _FANCY else plain
+
+
+OK = _sym("✅", "[OK]")
+FAIL = _sym("❌", "[FAIL]")
+WARN = _sym("⚠️", "[!]")
+SEARCH = _sym("🔍", "==>")
+PACKAGE = _sym("📦", "==>")
+FOLDER = _sym("📂", "==>")
+WRENCH = _sym("🔧", "==>")
+TEST = _sym("🧪", "==>")
+NOTE = _sym("📝", "-->")
+UP = _sym("↑", "^")
+
+_ASCII_TABLE = str.maketrans({
+    "═": "=", "║": "|", "╔": "+", "╗": "+", "╚": "+", "╝": "+",
+    "📖": "*", "⌨": "*", "🎵": "*", "✨": "*", "↑": "^", "↓": "v",
+    "\ufe0f": None,
+})
+
+# Общие флаги для всех вызовов pip install
+PIP_INSTALL_FLAGS = (
+    "--disable-pip-version-check", "--no-input", "--quiet", "--prefer-binary",
+)
+
+LOGO = r"""
     _________  ____ ________________________________________    ________ 
     \_   ___ \|    |   \______   \_   _____/\__    ___/  _  \  /  _____/ 
     /    \  \/|    |   /|    |  _/|    __)_   |    | /  /_\  \/   \  ___ 
@@ -24,121 +52,357 @@ def print_header():
     ═══════════════════════════════════════════════════════════════════════
                           CUBEEDIT INSTALLER
     ═══════════════════════════════════════════════════════════════════════
-    """
-    print(logo)
+    
+"""
+
+USAGE = """
+╔═════════════════════════════════════════════════════════════════════╗
+║                    УСТАНОВКА ЗАВЕРШЕНА!                             ║
+╚═════════════════════════════════════════════════════════════════════╝
+
+📖 Использование:
+    cubeedit [директория]
+
+Примеры:
+    cubeedit                    # Открыть в текущей директории
+    cubeedit ~/Music            # Открыть в ~/Music
+    cubeedit /path/to/music     # Открыть в указанной директории
+
+⌨️  Горячие клавиши:
+    ↑/↓        - Навигация
+    Tab        - Переключение панелей
+    Enter/e    - Редактировать тег
+    o          - Открыть файл
+    s          - Сохранить
+    r          - Перезагрузить
+    c/C        - Установить/удалить обложку
+    h          - Помощь
+    q          - Выход
+
+🎵 Поддерживаемые форматы:
+    MP3, FLAC, OGG/Vorbis/Opus, M4A/MP4, AAC, WAV, AIFF
+
+✨ Полная поддержка русских букв и Unicode!
+
+"""
+
+if not _FANCY:
+    LOGO = LOGO.translate(_ASCII_TABLE)
+    USAGE = USAGE.translate(_ASCII_TABLE)
+
+
+def emit(*lines):
+    """Вывод нескольких строк одной записью в stdout"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def print_header():
+    """Красивый заголовок"""
+    if not sys.stdout.isatty():
+        # В CI/логах логотип не нужен
+        return
+    sys.stdout.write(LOGO)
 
 
 def check_python_version():
     """Проверка версии Python"""
-    print("🔍 Проверка версии Python...")
+    print(f"{SEARCH} Проверка версии Python...")
     version = sys.version_info
-    if version.major < 3 or (version.major == 3 and version.minor < 6):
-        print("❌ Требуется Python 3.6 или выше!")
-        print(f"   Текущая версия: {sys.version}")
+    if version < (3, 6):
+        emit(f"{FAIL} Требуется Python 3.6 или выше!",
+             f"   Текущая версия: {sys.version}")
         return False
-    print(f"✅ Python {version.major}.{version.minor}.{version.micro}")
+    print(f"{OK} Python {version.major}.{version.minor}.{version.micro}")
     return True
 
 
-def install_dependencies():
-    """Установка зависимостей"""
-    print("\n📦 Проверка зависимостей...")
-    
-    # Проверка наличия pip
+def mutagen_available():
+    """Проверка наличия mutagen без импорта самого пакета"""
+    return importlib.util.find_spec("mutagen") is not None
+
+
+def mutagen_version():
+    """Версия установленного mutagen или None.
+
+    Читается из .dist-info/METADATA, сам пакет не импортируется.
+    """
     try:
-        subprocess.run([sys.executable, "-m", "pip", "--version"], 
-                      check=True, capture_output=True)
-        print("✅ pip найден")
-    except subprocess.CalledProcessError:
-        print("❌ pip не найден! Установите pip.")
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        # Python < 3.8: метаданных нет, проверяем через find_spec
+        if not mutagen_available():
+            return None
+        import mutagen
+        return mutagen.version_string
+    try:
+        return version("mutagen")
+    except PackageNotFoundError:
+        return None
+
+
+def run_pip(args):
+    """Запуск pip с выводом в консоль по мере работы.
+
+    Возвращает код выхода и последние строки вывода для сообщения об ошибке.
+    """
+    import subprocess
+    from collections import deque
+
+    # На Linux CPython 3.8+ запускает процесс через posix_spawn вместо fork+exec
+    # только если не заданы preexec_fn, pass_fds, cwd, start_new_session и
+    # close_fds=False. Дескрипторы установщика и так не наследуются (PEP 446),
+    # поэтому close_fds не нужен. Не добавляйте сюда эти аргументы без причины.
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "pip", *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        close_fds=False
+    )
+    tail = deque(maxlen=40)
+    for line in proc.stdout:
+        sys.stdout.write(f"   {line}")
+        tail.append(line)
+    proc.stdout.close()
+    return proc.wait(), "".join(tail)
+
+
+def get_pip_cache_dir():
+    """Постоянный кэш pip, чтобы повторные установки не качали mutagen заново.
+
+    None, если каталог создать нельзя (кэш только для чтения, на его месте
+    файл): тогда pip запускается со своим кэшем по умолчанию.
+    """
+    cache_root = (os.environ.get("XDG_CACHE_HOME")
+                  or os.path.join(os.path.expanduser("~"), ".cache"))
+    cache_dir = os.path.join(cache_root, "cubeedit-pip")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        return None
+    return cache_dir
+
+
+def pip_install(args):
+    """pip install только из готовых wheel, при их отсутствии - как обычно"""
+    code, output = run_pip(["install", "--only-binary=:all:", *args])
+    if code != 0 and "No matching distribution" in output:
+        code, output = run_pip(["install", *args])
+    return code, output
+
+
+def is_externally_managed():
+    """Python под управлением дистрибутива (PEP 668): pip install запрещён"""
+    import sysconfig
+
+    # В venv маркер системного Python не действует
+    if sys.prefix != getattr(sys, "base_prefix", sys.prefix):
         return False
+    stdlib = sysconfig.get_path("stdlib")
+    return bool(stdlib) and os.path.isfile(os.path.join(stdlib, "EXTERNALLY-MANAGED"))
+
+
+def install_dependencies(installed=None):
+    """Установка зависимостей
+
+    installed - версия mutagen, если main() уже проверил её заранее.
+    """
+    print(f"\n{PACKAGE} Проверка зависимостей...")
     
     # Проверка mutagen
     print("   Проверка mutagen...")
-    try:
-        import mutagen
-        print(f"✅ mutagen уже установлен (версия {mutagen.version_string})")
+    if installed is None:
+        installed = mutagen_version()
+    if installed:
+        print(f"{OK} mutagen уже установлен (версия {installed})")
         return True
-    except ImportError:
-        pass
     
-    # Установка mutagen
+    # На Debian/Ubuntu/Fedora pip откажется ставить пакеты в системный Python,
+    # нет смысла дважды запускать его ради ошибки externally-managed-environment
+    if is_externally_managed():
+        emit(f"{WARN}  Системный Python управляется дистрибутивом (PEP 668), pip недоступен",
+             "   Установите mutagen средствами системы, например:",
+             "    sudo apt install python3-mutagen    # Debian/Ubuntu",
+             "    sudo dnf install python3-mutagen    # Fedora",
+             "   или запустите установщик из виртуального окружения (venv)")
+        if mutagen_available():
+            print(f"{OK} Но mutagen доступен в системе, продолжаем...")
+            return True
+        return False
+    
+    # Установка mutagen. Отдельной проверки pip нет: если его нет,
+    # `python -m pip install` сам завершится с понятной ошибкой.
     print("   Установка mutagen...")
     try:
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "--user", "mutagen"],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
-            print("✅ mutagen установлен")
+        pip_flags = PIP_INSTALL_FLAGS
+        cache_dir = get_pip_cache_dir()
+        if cache_dir:
+            pip_flags = (*pip_flags, "--cache-dir", cache_dir)
+        code, output = pip_install(["--user", *pip_flags, "mutagen"])
+        if code == 0:
+            print(f"{OK} mutagen установлен")
             return True
+        elif "No module named pip" in output:
+            print(f"{FAIL} pip не найден! Установите pip.")
+            return False
         else:
             # Попробуем без --user
             print("   Повторная попытка без --user...")
-            result = subprocess.run(
-                [sys.executable, "-m", "pip", "install", "mutagen"],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                print("✅ mutagen установлен")
+            code, output = pip_install([*pip_flags, "mutagen"])
+            if code == 0:
+                print(f"{OK} mutagen установлен")
                 return True
             else:
-                print(f"⚠️  Предупреждение: не удалось установить mutagen автоматически")
-                print(f"   Stdout: {result.stdout}")
-                print(f"   Stderr: {result.stderr}")
-                print("\n   Попробуйте вручную: pip install mutagen")
+                emit(f"{WARN}  Предупреждение: не удалось установить mutagen автоматически",
+                     f"   Вывод pip (последние строки):\n{output}",
+                     "\n   Попробуйте вручную: pip install mutagen")
                 
                 # Проверяем, может он уже установлен в системе
-                try:
-                    import mutagen
-                    print("✅ Но mutagen доступен в системе, продолжаем...")
+                if mutagen_available():
+                    print(f"{OK} Но mutagen доступен в системе, продолжаем...")
                     return True
-                except ImportError:
-                    return False
+                return False
     except Exception as e:
-        print(f"❌ Ошибка при установке mutagen: {e}")
+        print(f"{FAIL} Ошибка при установке mutagen: {e}")
         # Всё равно проверяем
-        try:
-            import mutagen
-            print("✅ Но mutagen доступен, продолжаем...")
+        if mutagen_available():
+            print(f"{OK} Но mutagen доступен, продолжаем...")
             return True
-        except ImportError:
-            return False
+        return False
 
 
 def get_install_dir():
     """Определение директории установки"""
-    home = Path.home()
-    install_dir = home / ".local" / "bin"
+    home = os.path.expanduser("~")
+    install_dir = os.path.join(home, ".local", "bin")
+    
+    # Существующую доступную для записи директорию не трогаем: на NFS/SMB
+    # лишний mkdir - это запрос к серверу
+    if os.path.isdir(install_dir) and os.access(install_dir, os.W_OK):
+        return install_dir
     
     # Создание директории если не существует
-    install_dir.mkdir(parents=True, exist_ok=True)
+    os.makedirs(install_dir, exist_ok=True)
     
     return install_dir
 
 
-def copy_files(install_dir):
-    """Копирование файлов"""
-    print(f"\n📂 Установка в {install_dir}...")
+def get_source_file():
+    """Путь к tag_editor.py рядом с установщиком"""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(current_dir, "tag_editor.py")
+
+
+def get_digest_file():
+    """Файл с sha256 последней установленной версии"""
+    data_home = (os.environ.get("XDG_DATA_HOME")
+                 or os.path.join(os.path.expanduser("~"), ".local", "share"))
+    return os.path.join(data_home, "cubeedit", "installed.sha256")
+
+
+def file_sha256(path):
+    """sha256 файла в hex"""
+    import hashlib
+
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def read_installed_digest():
+    """sha256 из прошлой установки или None"""
+    try:
+        with open(get_digest_file(), encoding="ascii") as f:
+            return f.read().strip()
+    except (OSError, ValueError):
+        return None
+
+
+def write_installed_digest(digest):
+    """Запоминает sha256 установленной версии"""
+    digest_file = get_digest_file()
+    try:
+        os.makedirs(os.path.dirname(digest_file), exist_ok=True)
+        with open(digest_file, "w", encoding="ascii") as f:
+            f.write(digest + "\n")
+    except OSError:
+        # Не критично: в следующий раз просто выполним полную установку
+        pass
+
+
+def is_up_to_date(source_file, dest_file):
+    """Установленный файл совпадает с исходником (размер, mtime, права)"""
+    try:
+        src_st = os.stat(source_file)
+        # lstat: симлинк от --editable установки не считается копией
+        dst_st = os.lstat(dest_file)
+    except FileNotFoundError:
+        return False
+    # copy2 переносит mtime, поэтому после установки он совпадает с исходником
+    return (dst_st.st_size == src_st.st_size
+            and int(dst_st.st_mtime) == int(src_st.st_mtime)
+            and dst_st.st_mode & 0o777 == 0o755)
+
+
+def link_files(source_file, dest_file):
+    """Установка для разработки: симлинк на tag_editor.py из репозитория"""
+    # Симлинк запускает сам исходник, поэтому он должен быть исполняемым
+    mode = os.stat(source_file).st_mode
+    if mode & 0o111 != 0o111:
+        os.chmod(source_file, mode | 0o111)
+    try:
+        os.unlink(dest_file)
+    except FileNotFoundError:
+        pass
+    os.symlink(os.path.realpath(source_file), dest_file)
+
+
+def copy_files(install_dir, editable=False, force=False):
+    """Копирование файлов
+
+    force - копировать, даже если размер и mtime совпадают: main() передаёт
+    его, когда sha256 исходника изменился.
+    """
+    import shutil
+
+    print(f"\n{FOLDER} Установка в {install_dir}...")
     
-    current_dir = Path(__file__).parent
-    source_file = current_dir / "tag_editor.py"
+    source_file = get_source_file()
     
-    if not source_file.exists():
-        print(f"❌ Не найден файл: {source_file}")
+    if not os.path.exists(source_file):
+        print(f"{FAIL} Не найден файл: {source_file}")
         return False
     
     # Копирование основного скрипта
-    dest_file = install_dir / "cubeedit"
+    dest_file = os.path.join(install_dir, "cubeedit")
+    if editable:
+        try:
+            link_files(source_file, dest_file)
+        except OSError as e:
+            print(f"{FAIL} Ошибка создания ссылки: {e}")
+            return False
+        print(f"{OK} Установлено (editable): {dest_file} -> {os.path.realpath(source_file)}")
+        return True
+    if not force and is_up_to_date(source_file, dest_file):
+        print(f"{OK} Уже актуально: {dest_file}")
+        return True
+    # Копируем во временный файл и атомарно подменяем: прерванная установка
+    # или запущенный старый cubeedit не оставят обрезанный файл
+    tmp_file = dest_file + ".tmp"
     try:
-        shutil.copy2(source_file, dest_file)
+        shutil.copy2(source_file, tmp_file)
         # Сделать исполняемым
-        dest_file.chmod(0o755)
-        print(f"✅ Установлено: {dest_file}")
+        os.chmod(tmp_file, 0o755)
+        os.replace(tmp_file, dest_file)
+        print(f"{OK} Установлено: {dest_file}")
     except Exception as e:
-        print(f"❌ Ошибка копирования: {e}")
+        try:
+            os.unlink(tmp_file)
+        except FileNotFoundError:
+            pass
+        print(f"{FAIL} Ошибка копирования: {e}")
         return False
     
     return True
@@ -146,115 +410,137 @@ def copy_files(install_dir):
 
 def check_path(install_dir):
     """Проверка PATH и вывод инструкций"""
-    print("\n🔧 Проверка PATH...")
+    print(f"\n{WRENCH} Проверка PATH...")
     
-    path_env = os.environ.get("PATH", "")
-    install_dir_str = str(install_dir)
+    # Сравниваем нормализованные пути, а не подстроку PATH:
+    # "/home/x/.local/bin" не должен совпадать с "/home/x/.local/binoculars"
+    path_dirs = {
+        os.path.realpath(p)
+        for p in os.environ.get("PATH", "").split(os.pathsep)
+        if p
+    }
     
-    if install_dir_str in path_env:
-        print(f"✅ {install_dir} уже в PATH")
+    if os.path.realpath(install_dir) in path_dirs:
+        print(f"{OK} {install_dir} уже в PATH")
         return True
     else:
-        print(f"⚠️  {install_dir} НЕ в PATH")
-        print("\n📝 Добавьте следующую строку в ~/.bashrc или ~/.zshrc:")
-        print(f"\n    export PATH=\"$PATH:{install_dir}\"\n")
-        print("   Затем выполните:")
-        print(f"    source ~/.bashrc")
-        print("   или")
-        print(f"    source ~/.zshrc")
+        emit(f"{WARN}  {install_dir} НЕ в PATH",
+             f"\n{NOTE} Добавьте следующую строку в ~/.bashrc или ~/.zshrc:",
+             f"\n    export PATH=\"$PATH:{install_dir}\"\n",
+             "   Затем выполните:",
+             "    source ~/.bashrc",
+             "   или",
+             "    source ~/.zshrc")
         return False
 
 
 def test_installation(install_dir):
     """Тест установки"""
-    print("\n🧪 Проверка установки...")
+    print(f"\n{TEST} Проверка установки...")
     
-    cubeedit_path = install_dir / "cubeedit"
-    if cubeedit_path.exists() and os.access(cubeedit_path, os.X_OK):
-        print("✅ cubeedit установлен и исполняем")
+    # Один stat вместо exists() + access(): файл мы только что записали сами,
+    # так что бита исполнения для владельца достаточно
+    cubeedit_path = os.path.join(install_dir, "cubeedit")
+    try:
+        st = os.stat(cubeedit_path)
+    except FileNotFoundError:
+        st = None
+    if st is not None and st.st_mode & stat.S_IXUSR:
+        print(f"{OK} cubeedit установлен и исполняем")
         return True
     else:
-        print("❌ Проблема с правами доступа к cubeedit")
+        print(f"{FAIL} Проблема с правами доступа к cubeedit")
         return False
 
 
 def print_usage():
     """Инструкция по использованию"""
-    print("""
-╔═════════════════════════════════════════════════════════════════════╗
-║                    УСТАНОВКА ЗАВЕРШЕНА!                             ║
-╚═════════════════════════════════════════════════════════════════════╝
+    sys.stdout.write(USAGE)
 
-📖 Использование:
-    cubeedit [директория]
 
-Примеры:
-    cubeedit                    # Открыть в текущей директории
-    cubeedit ~/Music            # Открыть в ~/Music
-    cubeedit /path/to/music     # Открыть в указанной директории
+def parse_args():
+    """Разбор аргументов командной строки"""
+    import argparse
 
-⌨️  Горячие клавиши:
-    ↑/↓        - Навигация
-    Tab        - Переключение панелей
-    Enter/e    - Редактировать тег
-    o          - Открыть файл
-    s          - Сохранить
-    r          - Перезагрузить
-    c/C        - Установить/удалить обложку
-    h          - Помощь
-    q          - Выход
-
-🎵 Поддерживаемые форматы:
-    MP3, FLAC, OGG/Vorbis/Opus, M4A/MP4, AAC, WAV, AIFF
-
-✨ Полная поддержка русских букв и Unicode!
-""")
+    parser = argparse.ArgumentParser(description="Установщик CUBEEDIT")
+    parser.add_argument(
+        "-e", "--editable", action="store_true",
+        help="установить симлинк на tag_editor.py вместо копии (для разработки)"
+    )
+    return parser.parse_args()
 
 
 def main():
     """Основная функция установки"""
+    args = parse_args()
     print_header()
     
     # Проверка Python
     if not check_python_version():
         sys.exit(1)
     
-    # Установка зависимостей
-    if not install_dependencies():
-        print("\n❌ Установка прервана из-за ошибок с зависимостями")
-        sys.exit(1)
-    
-    # Определение директории установки
-    install_dir = get_install_dir()
+    # Независимые тихие проверки выполняем параллельно; всё, что печатает,
+    # остаётся последовательным, чтобы вывод не перемешивался
+    from concurrent.futures import ThreadPoolExecutor
+
+    source_file = get_source_file()
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        install_dir_future = pool.submit(get_install_dir)
+        mutagen_future = pool.submit(mutagen_version)
+        digest_future = None
+        if not args.editable and os.path.exists(source_file):
+            digest_future = pool.submit(file_sha256, source_file)
+        install_dir = install_dir_future.result()
+        src_digest = digest_future.result() if digest_future else None
     
-    # Копирование файлов
-    if not copy_files(install_dir):
-        print("\n❌ Установка прервана из-за ошибок копирования")
-        sys.exit(1)
+    # Повторный запуск: если tag_editor.py не менялся с прошлой установки,
+    # зависимости и копирование пропускаем
+    dest_file = os.path.join(install_dir, "cubeedit")
+    # Пропускаем установку, только если и файл актуален, и mutagen на месте:
+    # повторный запуск установщика должен чинить пропавшую зависимость
+    digest_changed = bool(src_digest) and src_digest != read_installed_digest()
+    if (src_digest and not digest_changed
+            and is_up_to_date(source_file, dest_file)
+            and mutagen_future.result() is not None):
+        print(f"\n{OK} {dest_file} уже установлен и актуален")
+    else:
+        # Установка зависимостей
+        if not install_dependencies(mutagen_future.result()):
+            print(f"\n{FAIL} Установка прервана из-за ошибок с зависимостями")
+            sys.exit(1)
+        
+        # Копирование файлов
+        # Размер и mtime не доказывают совпадения содержимого: правка того же
+        # размера в ту же секунду иначе оставила бы старый cubeedit
+        if not copy_files(install_dir, editable=args.editable, force=digest_changed):
+            print(f"\n{FAIL} Установка прервана из-за ошибок копирования")
+            sys.exit(1)
+        if src_digest:
+            write_installed_digest(src_digest)
     
     # Проверка PATH
     in_path = check_path(install_dir)
     
     # Тест установки
     if not test_installation(install_dir):
-        print("\n⚠️  Установка завершена с предупреждениями")
+        print(f"\n{WARN}  Установка завершена с предупреждениями")
     
     # Инструкция
     print_usage()
     
     if not in_path:
-        print("\n⚠️  ВАЖНО: Не забудьте добавить ~/.local/bin в PATH!")
-        print("   См. инструкции выше ↑")
+        emit(f"\n{WARN}  ВАЖНО: Не забудьте добавить ~/.local/bin в PATH!",
+             f"   См. инструкции выше {UP}")
     else:
-        print("\n✅ Всё готово! Запустите: cubeedit")
+        print(f"\n{OK} Всё готово! Запустите: cubeedit")
 
 
 if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
-        print("\n\n⚠️  Установка прервана пользователем")
+        print(f"\n\n{WARN}  Установка прервана пользователем")
         sys.exit(1)
     except Exception as e:
-        print(f"\n❌ Непредвиденная ошибка: {e}")
+        print(f"\n{FAIL} Непредвиденная ошибка: {e}")
         sys.exit(1)
@@ -4,25 +4,48 @@ import curses.panel
 import os
 import sys
 import locale
-from typing import List, Dict, Optional, Tuple
+import json
+import struct
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Callable, List, Dict, Optional, Set, Tuple
 
 # External dependency
 try:
     from mutagen import File as MutagenFile
-    from mutagen.id3 import ID3, APIC, ID3NoHeaderError
+    from mutagen.id3 import ID3, APIC, ID3NoHeaderError, ID3FileType
+    from mutagen.easyid3 import EasyID3FileType
     from mutagen.flac import FLAC, Picture
     from mutagen.mp4 import MP4, MP4Cover
+    from mutagen.mp3 import MP3, EasyMP3
+    from mutagen.easymp4 import EasyMP4
     from mutagen.oggvorbis import OggVorbis
     from mutagen.oggopus import OggOpus
-    import base64
-    import mimetypes
+    from mutagen.trueaudio import TrueAudio, EasyTrueAudio
 except Exception as e:
     MutagenFile = None  # type: ignore
 
+# Optional SIMD base64 for large Vorbis/Opus covers, same API as the stdlib module
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 SUPPORTED_EXTS = {
     ".mp3", ".flac", ".ogg", ".oga", ".opus", ".m4a", ".mp4", ".aac", ".wav", ".aiff", ".aif"
 }
-IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+# Cover image types by extension; avoids loading the system mimetypes database
+IMAGE_MIME = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".bmp": "image/bmp",
+}
+IMAGE_EXTS = set(IMAGE_MIME)
+
+# Vorbis comment keys that carry embedded cover art
+VORBIS_COVER_KEYS = ("metadata_block_picture", "coverart", "coverartmime")
 
 # Common, easy tag names we'll expose in the UI
 DEFAULT_FIELDS = [
@@ -37,19 +60,156 @@ DEFAULT_FIELDS = [
     ("comment", "Comment"),
 ]
 
+# ASCII logo shown at the top of the main screen
+LOGO = [
+    "_________  ____ ________________________________________    ________ ",
+    r"\_   ___ \|    |   \______   \_   _____/\__    ___/  _  \  /  _____/ ",
+    r"/    \  \/|    |   /|    |  _/|    __)_   |    | /  /_\  \/   \  ___ ",
+    r"\     \___|    |  / |    |   \|        \  |    |/    |    \    \_\  \ ",
+    r" \______  /______/  |______  /_______  /  |____|\____|__  /\______  /",
+    r"        \/                 \/        \/                 \/        \/ ",
+]
+
+FOOTER_LINES = 3
+FOOTER = (
+    "[↑↓] Navigate  [Tab] Switch  [Enter/e] Edit  [o] Open  [s] Save  [r] Reload",
+    "[c] Set Cover  [C] Clear Cover  [h] Help  [q] Quit",
+)
+
+# Independently repainted parts of the main screen, in drawing order; each
+# has a window in Tui.wins and a Tui.draw_<region> method
+REGIONS = ("header", "browser", "tags", "status", "cover", "footer")
+
+# Contents of the help window, and its widest line
+HELP_TEXT = (
+    "ytx-tag help",
+    "",
+    "Navigation:",
+    "  ↑/↓        Move in file list or fields",
+    "  ←/→, Tab   Switch between files and tags panes",
+    "  Enter      Open dir/file (left) or edit field (right)",
+    "  Backspace  Up to parent dir",
+    "  o          Open music file via modal picker",
+    "",
+    "Editing:",
+    "  s          Save tags",
+    "  r          Reload tags from file",
+    "  c / C      Set cover (choose image) / Clear cover",
+    "",
+    "File picker (modal):",
+    "  ↑/↓        Move",
+    "  Enter      Enter directory / select file",
+    "  Backspace  Go to parent directory",
+    "  ESC        Cancel",
+    "",
+    "Other:",
+    "  q          Quit",
+    "  h or ?     Show this help",
+)
+HELP_MAXLEN = max(map(len, HELP_TEXT))
+
+# Rows of a listing the file picker keeps rendered in its pad; ncurses pads
+# are limited to 32767 rows, and huge directories should not cost memory
+# and open time in proportion to their size
+PICKER_PAD_ROWS = 256
+
+# Key codes, computed once instead of per key press. Terminals send Enter as
+# CR or LF and Backspace as DEL or BS besides the curses key codes.
+KEY_ESC = 27
+KEY_TAB = 9
+KEYS_ENTER = frozenset((curses.KEY_ENTER, 10, 13))
+KEYS_BACKSPACE = frozenset((curses.KEY_BACKSPACE, 127, 8))
+KEY_e, KEY_o, KEY_c, KEY_C, KEY_h = map(ord, "eocCh")
+KEYS_QUIT = frozenset(map(ord, "qQ"))
+KEYS_SAVE = frozenset(map(ord, "sS"))
+KEYS_RELOAD = frozenset(map(ord, "rR"))
+KEYS_HELP = frozenset((KEY_h, ord("?")))
+
 
 def human_join(values: List[str]) -> str:
     return ", ".join(v for v in values if v)
 
 
-def normalize_value(v):
+def boxed_line(content: str, width: int) -> str:
+    """content padded with a right border "│" to exactly width columns"""
+    return (content.ljust(width - 1) + "│")[:width]
+
+
+def new_win(nlines: int, ncols: int, y: int, x: int):
+    """curses.newwin, or None when the area does not fit on the screen"""
+    if nlines <= 0 or ncols <= 0 or y < 0:
+        return None
+    try:
+        return curses.newwin(nlines, ncols, y, x)
+    except curses.error:
+        return None
+
+
+def b64_prefix(data: str, nbytes: int) -> bytes:
+    """Decode only as much of a base64 string as needed for its first nbytes"""
+    return base64.b64decode(data[: -(-nbytes // 3) * 4])
+
+
+def b64_decoded_len(data: str) -> int:
+    """Length of the bytes a base64 string decodes to, computed without decoding"""
+    if len(data) % 4:
+        raise ValueError("Invalid base64 length")
+    return len(data) // 4 * 3 - data.count("=", -2)
+
+
+def picture_block_info(data: str) -> Tuple[str, int]:
+    """(mime, image size) of a base64 FLAC picture block, without decoding the image.
+
+    Layout: type, mime length, mime, desc length, desc, width, height,
+    depth, colors, data length, data - all lengths are big-endian u32.
+    """
+    mime_len = struct.unpack(">I", b64_prefix(data, 8)[4:8])[0]
+    off = 8 + mime_len
+    head = b64_prefix(data, off + 4)
+    mime = head[8:off].decode("ascii", "replace")
+    desc_len = struct.unpack(">I", head[off:off + 4])[0]
+    off += 4 + desc_len + 16
+    size = struct.unpack(">I", b64_prefix(data, off + 4)[off:off + 4])[0]
+    return mime, size
+
+
+# Shared result for missing tags; callers only read the returned list
+_EMPTY: List[str] = []
+
+
+def drop_vorbis_cover(tags):
+    """Remove all cover keys from a Vorbis comment in one pass.
+
+    VCommentDict is a list of (key, value) pairs, and each `in`/`del` on it
+    scans the whole list; its pop() is list.pop and takes no default.
+    """
+    tags[:] = [kv for kv in tags if kv[0].lower() not in VORBIS_COVER_KEYS]
+
+
+def normalize_value(v) -> List[str]:
     if v is None:
-        return []
-    if isinstance(v, list):
-        return [str(x) for x in v]
+        return _EMPTY
+    t = type(v)
+    if t is list:
+        # Easy tags are almost always list[str] already: return as is
+        if all(type(x) is str for x in v):
+            return v
+        return [x if type(x) is str else str(x) for x in v]
+    if t is str:
+        return [v]
     return [str(v)]
 
 
+# Formats whose easy tag interface is a separate file class, the same
+# substitutions mutagen.File(easy=True) makes
+EASY_TYPES = {
+    MP3: EasyMP3,
+    MP4: EasyMP4,
+    ID3FileType: EasyID3FileType,
+    TrueAudio: EasyTrueAudio,
+} if MutagenFile is not None else {}
+
+
 class TagIO:
     """Thin wrapper around mutagen easy tags + cover art helpers."""
 
@@ -57,10 +217,25 @@ class TagIO:
         if MutagenFile is None:
             raise RuntimeError("mutagen is not installed. Please install requirements.txt")
         self.path = path
-        self.audio = MutagenFile(path, easy=True)
-        self.raw = MutagenFile(path)  # non-easy for cover art access
+        self._open()
         self.format_name = type(self.audio).__name__ if self.audio else "Unknown"
         self.readonly = False
+        # get_cover_info() result, valid until the cover is changed
+        self._cover_info: Optional[str] = None
+        self._cover_info_valid = False
+
+    def _open(self):
+        """Parse self.path into self.raw and self.audio"""
+        self.raw = MutagenFile(self.path)  # non-easy for cover art access
+        easy_type = EASY_TYPES.get(type(self.raw))
+        if easy_type is None:
+            # FLAC, Ogg, WAV, ... have no easy variant: MutagenFile(easy=True)
+            # would parse the very same class again, so share one object
+            self.audio = self.raw
+        else:
+            # mutagen can't wrap already parsed ID3/MP4 tags in the easy
+            # interface; open the known type directly without format probing
+            self.audio = easy_type(self.path)
 
     def is_supported(self) -> bool:
         return self.audio is not None
@@ -74,19 +249,22 @@ class TagIO:
             v = None
         return normalize_value(v)
 
-    def set(self, key: str, value: str):
-        if not self.audio:
+    def set_many(self, updates: Dict[str, str]):
+        """Apply several fields in one pass; empty values clear the tag"""
+        audio = self.audio
+        if audio is None:
             return
-        try:
-            if value == "":
-                # Empty value clears the tag
-                if key in self.audio:
-                    del self.audio[key]
-            else:
-                self.audio[key] = [value]
-        except Exception:
-            # Silently ignore unsupported keys for this format
-            pass
+        for key, value in updates.items():
+            # Guarded per key: a batch update() would stop at the first key
+            # the format rejects (EasyID3 has no 'comment') and drop the rest
+            try:
+                if value:
+                    audio[key] = [value]
+                else:
+                    # One lookup instead of `in` followed by `del`
+                    audio.pop(key, None)
+            except Exception:
+                pass
 
     def save(self) -> Tuple[bool, Optional[str]]:
         if not self.audio:
@@ -99,6 +277,10 @@ class TagIO:
                 except Exception:
                     pass
             self.audio.save()
+            if self.raw is not self.audio:
+                # raw still holds the tags from before the save; a later cover
+                # write saves it and would put them back
+                self._open()
             return True, None
         except Exception as e:
             return False, str(e)
@@ -109,176 +291,362 @@ class TagIO:
         return info is not None
 
     def get_cover_info(self) -> Optional[str]:
+        if not self._cover_info_valid:
+            self._cover_info = self._read_cover_info()
+            self._cover_info_valid = True
+        return self._cover_info
+
+    def _read_cover_info(self) -> Optional[str]:
+        # Only sizes are reported, so image bytes are never copied or decoded
+        handler = self._COVER_INFO.get(type(self.raw), TagIO._id3_cover_info)
         try:
-            if isinstance(self.raw, FLAC):
-                pics = getattr(self.raw, 'pictures', [])
-                if pics:
-                    p = pics[0]
-                    size = len(p.data) if p.data else 0
-                    return f"FLAC picture: {p.mime or 'image/*'} ({size} bytes)"
-            elif isinstance(self.raw, MP4):
-                covr = self.raw.tags.get('covr') if self.raw.tags else None
-                if covr:
-                    fmt = 'jpeg' if covr[0].imageformat == MP4Cover.FORMAT_JPEG else 'png'
-                    size = len(bytes(covr[0]))
-                    return f"MP4 cover: image/{fmt} ({size} bytes)"
-            elif isinstance(self.raw, (OggVorbis, OggOpus)):
-                tags = self.raw.tags
-                if not tags:
-                    return None
-                mbp = tags.get('metadata_block_picture')
-                if mbp:
-                    try:
-                        b = base64.b64decode(mbp[0])
-                        size = len(b)
-                        return f"Vorbis/Opus picture: ({size} bytes)"
-                    except Exception:
-                        return "Vorbis/Opus picture: (unreadable)"
-                coverart = tags.get('coverart')
-                if coverart:
-                    try:
-                        b = base64.b64decode(coverart[0])
-                        mime = tags.get('coverartmime', ['image/jpeg'])[0]
-                        return f"Vorbis/Opus coverart: {mime} ({len(b)} bytes)"
-                    except Exception:
-                        return "Vorbis/Opus coverart present"
-            elif hasattr(self.raw, 'tags') and isinstance(self.raw.tags, ID3):
-                id3 = self.raw.tags
-                apics = id3.getall('APIC') if id3 else []
-                if apics:
-                    a = apics[0]
-                    size = len(a.data) if a.data else 0
-                    return f"ID3 APIC: {a.mime or 'image/*'} ({size} bytes)"
+            return handler(self)
         except Exception:
             return None
-        return None
 
     def clear_cover(self) -> Tuple[bool, Optional[str]]:
+        self._cover_info_valid = False
+        handler = self._CLEAR_COVER.get(type(self.raw), TagIO._id3_clear_cover)
         try:
-            if isinstance(self.raw, FLAC):
-                self.raw.clear_pictures()
-                self.raw.save()
-                return True, None
-            elif isinstance(self.raw, MP4):
-                if self.raw.tags is None:
-                    self.raw.add_tags()
-                self.raw.tags['covr'] = []
-                self.raw.save()
-                return True, None
-            elif isinstance(self.raw, (OggVorbis, OggOpus)):
-                tags = self.raw.tags
-                if tags is None:
-                    return True, None
-                for key in ['metadata_block_picture', 'coverart', 'coverartmime']:
-                    if key in tags:
-                        del tags[key]
-                self.raw.save()
-                return True, None
-            elif hasattr(self.raw, 'tags'):
-                try:
-                    id3 = ID3(self.path)
-                except ID3NoHeaderError:
-                    return True, None
-                for k in list(id3.keys()):
-                    if k.startswith('APIC'):
-                        del id3[k]
-                id3.save(self.path)
-                return True, None
+            ok, err = handler(self)
+            if ok:
+                self._reload_stale()
+            return ok, err
         except Exception as e:
             return False, str(e)
-        return False, "Unsupported format for cover removal"
 
     def set_cover(self, image_path: str) -> Tuple[bool, Optional[str]]:
+        self._cover_info_valid = False
+        handler = self._SET_COVER.get(type(self.raw), TagIO._id3_set_cover)
         try:
-            with open(image_path, 'rb') as f:
+            # Unbuffered: FileIO.readall() sizes the result from fstat and
+            # reads the image straight into it, no intermediate buffer
+            with open(image_path, 'rb', buffering=0) as f:
                 data = f.read()
-            mime, _ = mimetypes.guess_type(image_path)
-            if not mime or not mime.startswith('image/'):
-                # default to jpeg
-                mime = 'image/jpeg'
-
-            if isinstance(self.raw, FLAC):
-                pic = Picture()
-                pic.type = 3  # front cover
-                pic.mime = mime
-                pic.desc = 'cover'
-                pic.data = data
-                # Clearing existing pictures and adding one
-                self.raw.clear_pictures()
-                self.raw.add_picture(pic)
-                self.raw.save()
-                return True, None
-            elif isinstance(self.raw, MP4):
-                if self.raw.tags is None:
-                    self.raw.add_tags()
-                fmt = MP4Cover.FORMAT_JPEG
-                if mime == 'image/png':
-                    fmt = MP4Cover.FORMAT_PNG
-                self.raw.tags['covr'] = [MP4Cover(data, imageformat=fmt)]
-                self.raw.save()
-                return True, None
-            elif isinstance(self.raw, (OggVorbis, OggOpus)):
-                # Use METADATA_BLOCK_PICTURE with embedded FLAC picture structure
-                pic = Picture()
-                pic.type = 3
-                pic.mime = mime
-                pic.desc = 'cover'
-                pic.data = data
-                b64 = base64.b64encode(pic.write()).decode('ascii')
-                tags = self.raw.tags
-                if tags is None:
-                    self.raw.add_tags()
-                    tags = self.raw.tags
-                if 'coverart' in tags:
-                    del tags['coverart']
-                if 'coverartmime' in tags:
-                    del tags['coverartmime']
-                tags['metadata_block_picture'] = [b64]
-                self.raw.save()
-                return True, None
-            else:
-                # Try ID3 fallback for MP3/others
-                try:
-                    try:
-                        id3 = ID3(self.path)
-                    except ID3NoHeaderError:
-                        id3 = ID3()
-                    # remove existing APICs
-                    for k in list(id3.keys()):
-                        if k.startswith('APIC'):
-                            del id3[k]
-                    id3.add(APIC(encoding=3, mime=mime, type=3, desc='cover', data=data))
-                    id3.save(self.path)
-                    return True, None
-                except Exception:
-                    pass
+            # default to jpeg
+            mime = IMAGE_MIME.get(os.path.splitext(image_path)[1].lower(), 'image/jpeg')
+            ok, err = handler(self, data, mime)
+            if ok:
+                self._reload_stale()
+            return ok, err
         except Exception as e:
             return False, str(e)
+
+    def _reload_stale(self):
+        """Re-read the file after a cover write unless nothing went stale.
+
+        The native handlers save through self.raw, which FLAC and Ogg share
+        with self.audio, so those stay current. An easy wrapper (MP3, MP4)
+        or the ID3 fallback's own ID3 object leaves the other parse behind;
+        raw and audio are then read again together.
+        """
+        if self.raw is not self.audio or type(self.raw) not in self._SET_COVER:
+            self._open()
+
+    # FLAC: native picture blocks
+    def _flac_cover_info(self) -> Optional[str]:
+        pics = getattr(self.raw, 'pictures', [])
+        if pics:
+            p = pics[0]
+            size = len(p.data) if p.data else 0
+            return f"FLAC picture: {p.mime or 'image/*'} ({size} bytes)"
+        return None
+
+    def _flac_clear_cover(self) -> Tuple[bool, Optional[str]]:
+        self.raw.clear_pictures()
+        self.raw.save()
+        return True, None
+
+    def _flac_set_cover(self, data: bytes, mime: str) -> Tuple[bool, Optional[str]]:
+        pic = Picture()
+        pic.type = 3  # front cover
+        pic.mime = mime
+        pic.desc = 'cover'
+        pic.data = data
+        # Clearing existing pictures and adding one
+        self.raw.clear_pictures()
+        self.raw.add_picture(pic)
+        self.raw.save()
+        return True, None
+
+    # MP4: 'covr' atom
+    def _mp4_cover_info(self) -> Optional[str]:
+        covr = self.raw.tags.get('covr') if self.raw.tags else None
+        if covr:
+            fmt = 'jpeg' if covr[0].imageformat == MP4Cover.FORMAT_JPEG else 'png'
+            size = len(covr[0])
+            return f"MP4 cover: image/{fmt} ({size} bytes)"
+        return None
+
+    def _mp4_clear_cover(self) -> Tuple[bool, Optional[str]]:
+        if self.raw.tags is None:
+            self.raw.add_tags()
+        self.raw.tags['covr'] = []
+        self.raw.save()
+        return True, None
+
+    def _mp4_set_cover(self, data: bytes, mime: str) -> Tuple[bool, Optional[str]]:
+        if self.raw.tags is None:
+            self.raw.add_tags()
+        fmt = MP4Cover.FORMAT_JPEG
+        if mime == 'image/png':
+            fmt = MP4Cover.FORMAT_PNG
+        self.raw.tags['covr'] = [MP4Cover(data, imageformat=fmt)]
+        self.raw.save()
+        return True, None
+
+    # Ogg Vorbis/Opus: base64 comments
+    def _vorbis_cover_info(self) -> Optional[str]:
+        tags = self.raw.tags
+        if not tags:
+            return None
+        mbp = tags.get('metadata_block_picture')
+        if mbp:
+            try:
+                mime, size = picture_block_info(mbp[0])
+                return f"Vorbis/Opus picture: {mime or 'image/*'} ({size} bytes)"
+            except Exception:
+                return "Vorbis/Opus picture: (unreadable)"
+        coverart = tags.get('coverart')
+        if coverart:
+            try:
+                size = b64_decoded_len(coverart[0])
+                mime = tags.get('coverartmime', ['image/jpeg'])[0]
+                return f"Vorbis/Opus coverart: {mime} ({size} bytes)"
+            except Exception:
+                return "Vorbis/Opus coverart present"
+        return None
+
+    def _vorbis_clear_cover(self) -> Tuple[bool, Optional[str]]:
+        tags = self.raw.tags
+        if tags is None:
+            return True, None
+        drop_vorbis_cover(tags)
+        self.raw.save()
+        return True, None
+
+    def _vorbis_set_cover(self, data: bytes, mime: str) -> Tuple[bool, Optional[str]]:
+        # Use METADATA_BLOCK_PICTURE with embedded FLAC picture structure
+        pic = Picture()
+        pic.type = 3
+        pic.mime = mime
+        pic.desc = 'cover'
+        pic.data = data
+        b64 = base64.b64encode(pic.write()).decode('ascii')
+        tags = self.raw.tags
+        if tags is None:
+            self.raw.add_tags()
+            tags = self.raw.tags
+        drop_vorbis_cover(tags)
+        tags['metadata_block_picture'] = [b64]
+        self.raw.save()
+        return True, None
+
+    # Everything else (MP3, WAV, AIFF, ...): ID3 APIC frames
+    def _id3_cover_info(self) -> Optional[str]:
+        if hasattr(self.raw, 'tags') and isinstance(self.raw.tags, ID3):
+            id3 = self.raw.tags
+            apics = id3.getall('APIC') if id3 else []
+            if apics:
+                a = apics[0]
+                size = len(a.data) if a.data else 0
+                return f"ID3 APIC: {a.mime or 'image/*'} ({size} bytes)"
+        return None
+
+    def _id3_clear_cover(self) -> Tuple[bool, Optional[str]]:
+        if not hasattr(self.raw, 'tags'):
+            return False, "Unsupported format for cover removal"
+        try:
+            id3 = ID3(self.path)
+        except ID3NoHeaderError:
+            return True, None
+        id3.delall('APIC')
+        id3.save(self.path)
+        return True, None
+
+    def _id3_set_cover(self, data: bytes, mime: str) -> Tuple[bool, Optional[str]]:
+        # Try ID3 fallback for MP3/others
+        try:
+            try:
+                id3 = ID3(self.path)
+            except ID3NoHeaderError:
+                id3 = ID3()
+            # remove existing APICs
+            id3.delall('APIC')
+            id3.add(APIC(encoding=3, mime=mime, type=3, desc='cover', data=data))
+            id3.save(self.path)
+            return True, None
+        except Exception:
+            pass
         return False, "Unsupported format for cover setting"
 
+    # Per-format handlers, looked up by type(self.raw); anything not listed
+    # goes through ID3
+    if MutagenFile is not None:
+        _COVER_INFO = {
+            FLAC: _flac_cover_info,
+            MP4: _mp4_cover_info,
+            OggVorbis: _vorbis_cover_info,
+            OggOpus: _vorbis_cover_info,
+        }
+        _CLEAR_COVER = {
+            FLAC: _flac_clear_cover,
+            MP4: _mp4_clear_cover,
+            OggVorbis: _vorbis_clear_cover,
+            OggOpus: _vorbis_clear_cover,
+        }
+        _SET_COVER = {
+            FLAC: _flac_set_cover,
+            MP4: _mp4_set_cover,
+            OggVorbis: _vorbis_set_cover,
+            OggOpus: _vorbis_set_cover,
+        }
+    else:
+        _COVER_INFO = _CLEAR_COVER = _SET_COVER = {}
+
+
+class TagCache:
+    """Tags and cover info of already parsed files, persisted between runs.
+
+    An entry is valid while the file's mtime and size are unchanged, so
+    reopening an untouched file needs no mutagen parse at all.
+    """
+
+    MAX_ENTRIES = 5000
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+            path = os.path.join(cache_home, "cubetagedit", "tags.json")
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        self.changed = False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.entries = data
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _stamp(path: str) -> Optional[List[int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def get(self, path: str) -> Optional[Tuple[Dict[str, str], Optional[str]]]:
+        entry = self.entries.get(path)
+        if not isinstance(entry, dict) or entry.get("stamp") != self._stamp(path):
+            return None
+        tags, cover = entry.get("tags"), entry.get("cover")
+        # The file may have been edited by hand or by another version: an
+        # entry of the wrong shape is a miss, not an error
+        if (not isinstance(tags, dict)
+                or not all(isinstance(tags.get(k), str) for k, _ in DEFAULT_FIELDS)
+                or not (cover is None or isinstance(cover, str))):
+            return None
+        if next(reversed(self.entries)) != path:
+            # A hit counts as a use: move it to the newest end so the
+            # MAX_ENTRIES cap evicts files that are not opened any more
+            self.entries[path] = self.entries.pop(path)
+            self.changed = True
+        return tags, cover
+
+    def put(self, path: str, tags: Dict[str, str], cover_info: Optional[str]):
+        stamp = self._stamp(path)
+        if stamp is None:
+            return
+        # Re-insert so the dict stays ordered from oldest to newest use
+        self.entries.pop(path, None)
+        self.entries[path] = {
+            "stamp": stamp,
+            "tags": {k: tags.get(k, "") for k, _ in DEFAULT_FIELDS},
+            "cover": cover_info,
+        }
+        while len(self.entries) > self.MAX_ENTRIES:
+            del self.entries[next(iter(self.entries))]
+        self.changed = True
+
+    def invalidate(self, path: str):
+        if self.entries.pop(path, None) is not None:
+            self.changed = True
+
+    def save(self):
+        if not self.changed:
+            return
+        tmp = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # ASCII output: paths that are not valid UTF-8 carry surrogate
+            # escapes, which json writes as \u escapes and reads back intact
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp, self.path)
+            self.changed = False
+        except (OSError, ValueError):
+            # The cache is only an optimization; never leave a partial file
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
 class FileBrowser:
+    # Directories whose listing and selection are kept, least recently
+    # visited dropped first
+    CACHE_SIZE = 16
+
     def __init__(self, root: str, exts: Optional[set] = None):
         self.root = os.path.abspath(root)
+        # Display names, directories first and shown with a trailing "/"
         self.entries: List[str] = []
+        # Parallel to entries: whether each one is a directory
+        self.is_dir: List[bool] = []
         self.selection = 0
         self.exts = exts or SUPPORTED_EXTS
+        self._ext_tuple = tuple(self.exts)
+        # root -> (mtime_ns, entries, is_dir, selection) of recently visited
+        # directories, so going back to one needs no rescan and puts the
+        # selection where it was
+        self._dir_cache: "OrderedDict[str, Tuple[Optional[int], List[str], List[bool], int]]" = OrderedDict()
         self.refresh()
 
     def refresh(self):
-        items = []
         try:
-            for name in os.listdir(self.root):
-                path = os.path.join(self.root, name)
-                if os.path.isdir(path):
-                    items.append(name + "/")
-                else:
-                    ext = os.path.splitext(name)[1].lower()
-                    if ext in self.exts:
-                        items.append(name)
+            mtime = os.stat(self.root).st_mtime_ns
         except FileNotFoundError:
-            items = []
-        items.sort(key=lambda n: (not n.endswith("/"), n.lower()))
-        self.entries = items
+            mtime = None
+        cache = self._dir_cache
+        cached = cache.get(self.root)
+        if cached is not None and cached[0] == mtime:
+            # Directory unchanged since it was last scanned
+            self.entries, self.is_dir = cached[1:3]
+            cache.move_to_end(self.root)
+        else:
+            dirs, files = [], []
+            try:
+                # DirEntry.is_dir() uses the type from readdir, no stat per entry
+                with os.scandir(self.root) as it:
+                    for de in it:
+                        if de.is_dir():
+                            dirs.append(de.name + "/")
+                        elif de.name.lower().endswith(self._ext_tuple):
+                            files.append(de.name)
+            except FileNotFoundError:
+                dirs, files = [], []
+            # Directories first, each group case-insensitively; kept apart
+            # during the scan so the sort key is the plain C str.lower
+            dirs.sort(key=str.lower)
+            files.sort(key=str.lower)
+            self.entries = dirs + files
+            self.is_dir = [True] * len(dirs) + [False] * len(files)
+            cache[self.root] = (mtime, self.entries, self.is_dir, self.selection)
+            cache.move_to_end(self.root)
+            if len(cache) > self.CACHE_SIZE:
+                cache.popitem(last=False)
         if self.selection >= len(self.entries):
             self.selection = max(0, len(self.entries) - 1)
 
@@ -286,26 +654,42 @@ class FileBrowser:
         if not self.entries:
             return None
         name = self.entries[self.selection]
-        path = os.path.join(self.root, name.rstrip("/"))
-        if name.endswith("/"):
-            self.root = os.path.abspath(path)
-            self.selection = 0
-            self.refresh()
+        if self.is_dir[self.selection]:
+            self.chdir(os.path.abspath(os.path.join(self.root, name[:-1])))
             return None
-        return path
+        return os.path.join(self.root, name)
 
-    def up(self):
-        self.selection = (self.selection - 1) % max(1, len(self.entries))
+    def up(self) -> bool:
+        """Move the selection up (wrapping); False if it stayed put"""
+        old = self.selection
+        self.selection = (old - 1) % max(1, len(self.entries))
+        return self.selection != old
 
-    def down(self):
-        self.selection = (self.selection + 1) % max(1, len(self.entries))
+    def down(self) -> bool:
+        """Move the selection down (wrapping); False if it stayed put"""
+        old = self.selection
+        self.selection = (old + 1) % max(1, len(self.entries))
+        return self.selection != old
 
-    def parent(self):
+    def parent(self) -> bool:
+        """Go to the parent directory; False when already at the top"""
         parent = os.path.dirname(self.root)
         if parent and parent != self.root:
-            self.root = parent
-            self.selection = 0
-            self.refresh()
+            self.chdir(parent)
+            return True
+        return False
+
+    def chdir(self, path: str):
+        """Switch to path, restoring the selection it had when last left"""
+        cache = self._dir_cache
+        cached = cache.get(self.root)
+        if cached is not None:
+            # Remember the selection for coming back here
+            cache[self.root] = cached[:3] + (self.selection,)
+        self.root = path
+        cached = cache.get(path)
+        self.selection = cached[3] if cached is not None else 0
+        self.refresh()
 
 
 class Tui:
@@ -320,15 +704,67 @@ class Tui:
         self.focus = "browser"  # browser, tags, or cover
         self.last_error: Optional[str] = None
         self.cover_info: Optional[str] = None
-        self.theme = None  # set later
+        # Parsed tags of current_path, reused for save and cover operations
+        self._io: Optional[TagIO] = None
+        self.tag_cache = TagCache()
+        # Cleared by the quit key to end loop()
+        self.running = True
+        # A modal was hidden and is still on the terminal until the next flush
+        self._modal_closed = False
+        # Screen size, re-read only when curses reports KEY_RESIZE
+        self._size: Tuple[int, int] = stdscr.getmaxyx()
+        # Panel windows and border/filler strings for the current screen size
+        self._geom: Optional[Tuple[int, int]] = None
+        self._tpl: Dict[str, str] = {}
+        self.wins: Dict[str, Optional["curses.window"]] = {}
+        self._panels: list = []
+        # Regions to repaint at the next flush_dirty(), and the lines last
+        # written to each window so unchanged rows are skipped
+        self._dirty_regions: Set[str] = set()
+        self._shown: Dict[str, List[Tuple[str, int]]] = {}
+        self._tag_labels: List[Tuple[str, str]] = []
+        # Key code -> handler, looked up once per key press
+        self._handlers: Dict[int, Callable[[], None]] = {}
+        for keys, handler in (
+            ((KEY_o,), self.on_open),
+            (KEYS_QUIT, self.on_quit),
+            (KEYS_HELP, self.help),
+            ((curses.KEY_RESIZE,), self.resize),
+            ((curses.KEY_UP,), self.on_up),
+            ((curses.KEY_DOWN,), self.on_down),
+            (KEYS_BACKSPACE, self.on_back),
+            (KEYS_ENTER | {KEY_e}, self.on_enter),
+            ((KEY_TAB, curses.KEY_BTAB), self.on_tab),
+            (KEYS_SAVE, self.on_save),
+            (KEYS_RELOAD, self.on_reload),
+            ((KEY_C,), self.on_clear_cover),
+            ((KEY_c,), self.on_set_cover),
+        ):
+            for key in keys:
+                self._handlers[key] = handler
+
+    def get_io(self) -> TagIO:
+        """TagIO for current_path, parsed once and reused until invalidated"""
+        if self._io is None or self._io.path != self.current_path:
+            self._io = TagIO(self.current_path)
+        return self._io
 
     def load_current(self):
+        # Always re-read from disk: this is also the "reload" action
+        self._io = None
         if self.current_path is None:
             self.tags = {k: "" for k, _ in DEFAULT_FIELDS}
             self.cover_info = None
             return
+        cached = self.tag_cache.get(self.current_path)
+        if cached is not None:
+            tags, self.cover_info = cached
+            self.tags = dict(tags)
+            self.dirty = False
+            self.last_error = None
+            return
         try:
-            io = TagIO(self.current_path)
+            io = self.get_io()
             if not io.is_supported():
                 self.status_msg = "Unsupported file"
                 self.tags = {k: "" for k, _ in DEFAULT_FIELDS}
@@ -339,6 +775,7 @@ class Tui:
                 new_tags[k] = human_join(io.get(k))
             self.tags = new_tags
             self.cover_info = io.get_cover_info()
+            self.tag_cache.put(self.current_path, self.tags, self.cover_info)
             self.dirty = False
             self.last_error = None
         except Exception as e:
@@ -351,13 +788,13 @@ class Tui:
         if self.current_path is None:
             return
         try:
-            io = TagIO(self.current_path)
+            io = self.get_io()
             if not io.is_supported():
                 self.status_msg = "Unsupported file"
                 return
-            for k, _ in DEFAULT_FIELDS:
-                io.set(k, self.tags.get(k, ""))
+            io.set_many({k: self.tags.get(k, "") for k, _ in DEFAULT_FIELDS})
             ok, err = io.save()
+            self.tag_cache.invalidate(self.current_path)
             if ok:
                 self.status_msg = "Saved"
                 self.dirty = False
@@ -377,667 +814,586 @@ class Tui:
             self.tags[key] = new_val
             self.dirty = True
 
-    def draw(self):
-        self.stdscr.clear()
-        h, w = self.stdscr.getmaxyx()
-        
-        current_line = 0
-        
-        # ASCII Logo
-        logo = [
-            "_________  ____ ________________________________________    ________ ",
-            r"\_   ___ \|    |   \______   \_   _____/\__    ___/  _  \  /  _____/ ",
-            r"/    \  \/|    |   /|    |  _/|    __)_   |    | /  /_\  \/   \  ___ ",
-            r"\     \___|    |  / |    |   \|        \  |    |/    |    \    \_\  \ ",
-            r" \______  /______/  |______  /_______  /  |____|\____|__  /\______  /",
-            r"        \/                 \/        \/                 \/        \/ ",
-        ]
-        for i, line in enumerate(logo):
-            try:
-                self.stdscr.addnstr(current_line, 0, line[: w], w, curses.A_BOLD)
-                current_line += 1
-            except curses.error:
-                pass
-        
+    def put(self, win, y: int, x: int, text: str, n: int, attr: int = 0):
         try:
-            self.stdscr.addnstr(current_line, 0, "─" * w, w)
-            current_line += 1
+            win.addnstr(y, x, text, n, attr)
         except curses.error:
             pass
-        
-        # Current file info
+
+    def layout(self, h: int, w: int):
+        """Rebuild panel windows and static strings when the screen size changes.
+
+        Returns True if it did, every window then has to be repainted.
+        """
+        if (h, w) == self._geom:
+            return False
+        top = len(LOGO) + 3
+        available = h - top - FOOTER_LINES
+        left = w // 2
+        right = w - left
+        self._tpl = {
+            "hline": "─" * w,
+            "dhline": "═" * w,
+            "files_top": "┌─ FILES " + "─" * max(0, left - 10) + "┐",
+            "files_filler": "│" + " " * (left - 2) + "│",
+            "tags_top": "┌─ TAGS " + "─" * max(0, right - 9) + "┐",
+            "tags_filler": "│" + " " * (right - 2) + "│",
+            "tags_dots": boxed_line("│  " + "·" * max(0, right - 4), right),
+        }
+        # Label line of every field, indexed by [field][is_selected]
+        self._tag_labels = [
+            (boxed_line(f"│  {label}:", right), boxed_line(f"│► {label}:", right))
+            for _, label in DEFAULT_FIELDS
+        ]
+        # The footer's divider row carries the status message (left) and
+        # the cover of the current file (right), key hints go below it
+        self.wins = {
+            "header": new_win(min(top, h), w, 0, 0),
+            "browser": new_win(available, left, top, 0),
+            "tags": new_win(available, right, top, left),
+            "status": new_win(1, left, h - FOOTER_LINES, 0),
+            "cover": new_win(1, right, h - FOOTER_LINES, left),
+            "footer": new_win(FOOTER_LINES - 1, w, h - FOOTER_LINES + 1, 0),
+        }
+        # Every window is a panel, so a modal panel hidden on top of them
+        # re-exposes exactly the cells it covered without a redraw
+        self._panels = [curses.panel.new_panel(win) for win in self.wins.values() if win is not None]
+        # Nothing is drawn on stdscr itself; flush its blank state once so
+        # the implicit refresh in stdscr.getch() never paints over panels
+        self.stdscr.erase()
+        self.stdscr.noutrefresh()
+        self._geom = (h, w)
+        return True
+
+    def blit(self, name: str, lines: List[Tuple[str, int]]):
+        """Write lines to a panel window, rewriting only rows that changed"""
+        win = self.wins.get(name)
+        if win is None:
+            return
+        width = win.getmaxyx()[1]
+        old = self._shown.get(name)
+        if old is None or len(old) != len(lines):
+            win.erase()
+            rows = enumerate(lines)
+        else:
+            rows = ((y, line) for y, line in enumerate(lines) if line != old[y])
+        for y, (text, attr) in rows:
+            if old is not None:
+                win.move(y, 0)
+                win.clrtoeol()
+            self.put(win, y, 0, text, width, attr)
+        self._shown[name] = lines
+
+    def invalidate(self, *regions: str):
+        """Mark regions for repaint; without arguments the whole screen,
+        e.g. after a modal was drawn over it"""
+        if regions:
+            self._dirty_regions.update(regions)
+        else:
+            self._shown.clear()
+            self._dirty_regions.update(REGIONS)
+
+    def draw(self):
+        self.invalidate()
+        self.flush_dirty()
+
+    def resize(self):
+        """Pick up the new terminal size after KEY_RESIZE"""
+        self._size = self.stdscr.getmaxyx()
+        self.invalidate()
+
+    def flush_dirty(self):
+        """Repaint the regions marked by invalidate() with one terminal update"""
+        h, w = self._size
+        if self.layout(h, w):
+            self.invalidate()
+        dirty = self._dirty_regions
+        for region in REGIONS:
+            if region in dirty:
+                getattr(self, "draw_" + region)()
+        dirty.clear()
+        self._modal_closed = False
+        # Stage every changed panel, then one terminal update
+        curses.panel.update_panels()
+        curses.doupdate()
+
+    def close_modal(self, panel):
+        """Take a modal off the screen; the panels below show through again.
+
+        The cells it covered are staged now and reach the terminal with the
+        next flush_dirty(), in the same update as the regions the modal's
+        result changed.
+        """
+        panel.hide()
+        # Hiding touches stdscr, the panel library's bottom panel; staging
+        # untouches it, or the next stdscr.getch() would refresh it on its own
+        curses.panel.update_panels()
+        self._modal_closed = True
+
+    def region_size(self, name: str) -> Tuple[int, int]:
+        win = self.wins.get(name)
+        return win.getmaxyx() if win is not None else (0, 0)
+
+    def draw_header(self):
+        """Logo and current file info between dividers"""
+        hline = self._tpl["hline"]
+        header = [(line, THEME.header) for line in LOGO]
+        header.append((hline, 0))
         if self.current_path:
             filename = os.path.basename(self.current_path)
             status = "[MODIFIED]" if self.dirty else "[SAVED]"
-            try:
-                self.stdscr.addnstr(current_line, 0, f"File: {filename} {status}"[: w], w)
-                current_line += 1
-            except curses.error:
-                pass
+            header.append((f"File: {filename} {status}", 0))
         else:
-            try:
-                self.stdscr.addnstr(current_line, 0, "No file selected - press [o] to open"[: w], w, curses.A_DIM)
-                current_line += 1
-            except curses.error:
-                pass
-        
-        try:
-            self.stdscr.addnstr(current_line, 0, "─" * w, w)
-            current_line += 1
-        except curses.error:
-            pass
-        
-        # Calculate available space
-        footer_lines = 3
-        available = h - current_line - footer_lines
-        
-        # Split screen: browser on left, tags on right
-        # Left panel: 0 to split_x-2, divider at split_x-1, right panel: split_x to w-1
-        split_x = w // 2
-        
-        # LEFT: File Browser with border
-        left_width = split_x
-        try:
-            # Top border: ┌─ FILES ─────┐
-            top_line = "┌─ FILES " + "─" * max(0, left_width - 10) + "┐"
-            self.stdscr.addnstr(current_line, 0, top_line[: left_width], left_width, curses.A_BOLD)
-        except curses.error:
-            pass
-        
-        browser_start = current_line + 1
-        browser_height = available - 1
-        
-        # Draw file list with borders
-        try:
-            dir_line = f"Dir: {self.browser.root}"
-            content = "│ " + dir_line
-            # Pad to fit and add right border
-            padded = content + " " * max(0, left_width - len(content) - 1) + "│"
-            self.stdscr.addnstr(browser_start, 0, padded[: left_width], left_width, curses.A_DIM)
-        except curses.error:
-            pass
-        
-        start_idx = max(0, self.browser.selection - browser_height + 3)
-        for i in range(start_idx, min(len(self.browser.entries), start_idx + browser_height - 2)):
-            line_y = browser_start + 1 + (i - start_idx)
-            if line_y >= h - footer_lines:
-                break
-            name = self.browser.entries[i]
-            marker = "►" if (i == self.browser.selection and self.focus == "browser") else " "
-            content = f"│{marker} {name}"
-            padded = content + " " * max(0, left_width - len(content) - 1) + "│"
-            try:
-                self.stdscr.addnstr(line_y, 0, padded[: left_width], left_width)
-            except curses.error:
-                pass
-        
-        # Fill remaining lines in left panel with borders
-        for line_y in range(browser_start + 1 + min(len(self.browser.entries), browser_height - 2), h - footer_lines):
-            try:
-                filler = "│" + " " * (left_width - 2) + "│"
-                self.stdscr.addnstr(line_y, 0, filler[: left_width], left_width)
-            except curses.error:
-                pass
-        
-        # Bottom border for left panel
-        try:
-            bottom = "└" + "─" * max(0, left_width - 2) + "┘"
-            self.stdscr.addnstr(h - footer_lines, 0, bottom[: left_width], left_width)
-        except curses.error:
-            pass
-        
-        # RIGHT: Tags with border
-        try:
-            top_line = "┌─ TAGS " + "─" * max(0, w - split_x - 10) + "┐"
-            self.stdscr.addnstr(current_line, split_x, top_line[: w - split_x], w - split_x, curses.A_BOLD)
-        except curses.error:
-            pass
-        
-        tags_start = current_line + 1
-        tags_height = available - 1
-        
-        if self.current_path:
-            # Draw tags with borders
-            start_idx = max(0, self.cursor_field - tags_height // 3)
-            current_y = tags_start
-            for i in range(start_idx, len(DEFAULT_FIELDS)):
-                if current_y >= h - footer_lines - 2:
-                    break
-                key, label = DEFAULT_FIELDS[i]
-                value = self.tags.get(key, "")
-                is_sel = (self.focus == "tags" and i == self.cursor_field)
-                
-                # Draw tag (3 lines with proper padding)
-                marker = "►" if is_sel else " "
-                right_width = w - split_x
-                try:
-                    # Label line
-                    label_content = f"│{marker} {label}:"
-                    label_padded = label_content + " " * max(0, right_width - 2 - len(label_content)) + "│"
-                    self.stdscr.addnstr(current_y, split_x, label_padded[: right_width], right_width, curses.A_BOLD if is_sel else 0)
-                    current_y += 1
-                    # Value line
-                    value_content = f"│  {value}"
-                    value_padded = value_content + " " * max(0, right_width - 2 - len(value_content)) + "│"
-                    self.stdscr.addnstr(current_y, split_x, value_padded[: right_width], right_width)
-                    current_y += 1
-                    # Separator
-                    if not is_sel:
-                        sep_content = "│  " + "·" * max(0, right_width - 4) + "│"
-                        self.stdscr.addnstr(current_y, split_x, sep_content[: right_width], right_width, curses.A_DIM)
-                    else:
-                        sep_padded = "│" + " " * (right_width - 2) + "│"
-                        self.stdscr.addnstr(current_y, split_x, sep_padded[: right_width], right_width)
-                    current_y += 1
-                except curses.error:
-                    break
-            
-            # Fill remaining space with borders
-            for line_y in range(current_y, h - footer_lines):
-                try:
-                    filler = "│" + " " * (right_width - 2) + "│"
-                    self.stdscr.addnstr(line_y, split_x, filler[: right_width], right_width)
-                except curses.error:
-                    pass
-        else:
-            right_width = w - split_x
-            try:
-                msg_content = "│ Open a file to edit tags"
-                msg_padded = msg_content + " " * max(0, right_width - 2 - len(msg_content)) + "│"
-                self.stdscr.addnstr(tags_start, split_x, msg_padded[: right_width], right_width, curses.A_DIM)
-            except curses.error:
-                pass
-            # Fill space with borders
-            for line_y in range(tags_start + 1, h - footer_lines):
-                try:
-                    filler = "│" + " " * (right_width - 2) + "│"
-                    self.stdscr.addnstr(line_y, split_x, filler[: right_width], right_width)
-                except curses.error:
-                    pass
-        
-        # Bottom border for right panel
-        try:
-            right_width = w - split_x
-            bottom = "└" + "─" * max(0, right_width - 2) + "┘"
-            self.stdscr.addnstr(h - footer_lines, split_x, bottom[: right_width], right_width)
-        except curses.error:
-            pass
-        
-        # Footer
-        try:
-            self.stdscr.addnstr(h - 3, 0, "═" * w, w)
-            footer1 = "[↑↓] Navigate  [Tab] Switch  [Enter/e] Edit  [o] Open  [s] Save  [r] Reload"
-            footer2 = "[c] Set Cover  [C] Clear Cover  [h] Help  [q] Quit"
-            self.stdscr.addnstr(h - 2, 0, footer1[: w], w)
-            self.stdscr.addnstr(h - 1, 0, footer2[: w], w)
-        except curses.error:
-            pass
-        
-        self.stdscr.refresh()
+            header.append(("No file selected - press [o] to open", THEME.dim))
+        header.append((hline, 0))
+        self.blit("header", header)
 
-    def draw_panel(self, y, x, h, w, title=""):
-        """Draw panel with Cubeplayer-style border and centered title"""
-        try:
-            win = curses.newwin(h, w, y, x)
-            # Top border with centered title
-            if title:
-                title_str = f" {title} "
-                pad_len = (w - len(title_str) - 2) // 2
-                top_line = "┌" + "─" * pad_len + title_str + "─" * (w - pad_len - len(title_str) - 2) + "┐"
-            else:
-                top_line = "┌" + "─" * (w - 2) + "┐"
-            win.addnstr(0, 0, top_line[: w], w)
-            
-            # Side borders
-            for i in range(1, h - 1):
-                try:
-                    win.addch(i, 0, "│")
-                    win.addch(i, w - 1, "│")
-                except curses.error:
-                    pass
-            
-            # Bottom border
-            bottom_line = "└" + "─" * (w - 2) + "┘"
-            win.addnstr(h - 1, 0, bottom_line[: w], w)
-            
-            win.noutrefresh()
-        except curses.error:
-            pass
+    # Split screen: browser on left, tags on right
+    # Each panel is prepared as a list of (line, attr) exactly as wide as
+    # its window
+    def draw_browser(self):
+        self.blit("browser", self.browser_lines(*self.region_size("browser")))
 
-    def draw_current_file_info(self, y, x, h, w):
-        """Draw current file info (like 'Now Playing' in Cubeplayer)"""
-        try:
-            win = curses.newwin(h, w, y, x)
-            if self.current_path:
-                filename = os.path.basename(self.current_path)
-                # Line 1: filename
-                win.addnstr(0, 0, f"File: {filename}"[: w - 1], w - 1)
-                # Line 2: status (modified/saved)
-                status = "Modified" if self.dirty else "Saved"
-                win.addnstr(1, 0, f"Status: {status}"[: w - 1], w - 1)
-            else:
-                win.addnstr(0, 0, "No file selected"[: w - 1], w - 1)
-            win.noutrefresh()
-        except curses.error:
-            pass
+    def draw_tags(self):
+        self.blit("tags", self.tag_lines(*self.region_size("tags")))
 
-    def draw_files(self, y, x, h, w):
-        try:
-            win = curses.newwin(h, w, y, x)
-            # Current directory header
-            header = f"Dir: {self.browser.root}"
-            win.addnstr(0, 0, header[: w - 1], w - 1, curses.A_DIM)
-            max_rows = h - 1
-            start = 0
-            if self.browser.selection >= max_rows:
-                start = self.browser.selection - max_rows + 1
-            for i in range(start, min(len(self.browser.entries), start + max_rows)):
-                name = self.browser.entries[i]
-                # Cubeplayer-style marker for selected item
-                marker = ">> " if (i == self.browser.selection and self.focus == "browser") else "   "
-                line = f"{marker}{name}"
-                win.addnstr(1 + i - start, 0, line[: w - 1], w - 1)
-            win.noutrefresh()
-        except curses.error:
-            pass
+    def draw_status(self):
+        self.blit("status", [(f"═ {self.status_msg} " + self._tpl["dhline"], THEME.status)])
 
-    def draw_cover(self, y, x, h, w):
-        try:
-            win = curses.newwin(h, w, y, x)
-            # Cover info
-            if self.cover_info:
-                win.addnstr(0, 0, f"Status: {self.cover_info}"[: w - 1], w - 1)
-            else:
-                win.addnstr(0, 0, "Status: No cover"[: w - 1], w - 1)
-            
-            # ASCII preview placeholder (future: actual cover to ASCII conversion)
-            for i in range(1, min(h - 1, 6)):
-                preview = "[  Cover Preview Here  ]" if i == 2 else ""
-                try:
-                    win.addnstr(i, 0, preview[: w - 1], w - 1, curses.A_DIM)
-                except curses.error:
-                    pass
-            
-            # Controls hint
-            hint = "[c] Set Cover   [C] Clear Cover"
-            try:
-                win.addnstr(h - 1, 0, hint[: w - 1], w - 1, curses.A_DIM)
-            except curses.error:
-                pass
-            win.noutrefresh()
-        except curses.error:
-            pass
+    def draw_cover(self):
+        if self.current_path:
+            text = f"═ Cover: {self.cover_info or 'none'} " + self._tpl["dhline"]
+        else:
+            text = self._tpl["dhline"]
+        self.blit("cover", [(text, 0)])
 
-    def draw_tags(self, y, x, h, w):
-        try:
-            win = curses.newwin(h, w, y, x)
-            if not self.current_path:
-                win.addnstr(0, 0, "Select a file to edit tags", w - 1, curses.A_DIM)
-                win.noutrefresh()
-                return
-            
-            # Calculate scrolling: show tags around the selected one
-            box_h = 3  # height per tag box
-            visible_tags = h // box_h  # how many tags fit in the view
-            
-            # Determine scroll offset to keep selected tag visible
-            start_idx = 0
-            if self.cursor_field >= visible_tags:
-                start_idx = self.cursor_field - visible_tags + 1
-            
-            # Draw each tag in a mini-box with scrolling
-            current_y = 0
+    def draw_footer(self):
+        self.blit("footer", [(FOOTER[0], 0), (FOOTER[1], 0)])
+
+    def browser_lines(self, height: int, width: int) -> List[Tuple[str, int]]:
+        """Lines of the FILES panel: border, current dir, entries, filler"""
+        lines = [
+            (self._tpl["files_top"], THEME.panel_title),
+            (boxed_line(f"│ Dir: {self.browser.root}", width), THEME.dim),
+        ]
+        rows = height - 3
+        start_idx = max(0, self.browser.selection - rows + 1)
+        for i in range(start_idx, min(len(self.browser.entries), start_idx + rows)):
+            name = self.browser.entries[i]
+            marker = "►" if (i == self.browser.selection and self.focus == "browser") else " "
+            lines.append((boxed_line(f"│{marker} {name}", width), 0))
+        filler = self._tpl["files_filler"]
+        lines.extend([(filler, 0)] * (height - len(lines)))
+        return lines[:height]
+
+    def tag_lines(self, height: int, width: int) -> List[Tuple[str, int]]:
+        """Lines of the TAGS panel: border, 3 lines per field, filler"""
+        lines = [(self._tpl["tags_top"], THEME.panel_title)]
+        filler = self._tpl["tags_filler"]
+        if self.current_path:
+            start_idx = max(0, self.cursor_field - (height - 1) // 3)
             for i in range(start_idx, len(DEFAULT_FIELDS)):
-                if current_y + box_h > h:
+                if len(lines) >= height - 2:
                     break
-                
-                key, label = DEFAULT_FIELDS[i]
+                key = DEFAULT_FIELDS[i][0]
                 value = self.tags.get(key, "")
                 is_sel = (self.focus == "tags" and i == self.cursor_field)
-                
-                # Draw mini-box
-                box_w = w
-                # Top border
+                lines.append((self._tag_labels[i][is_sel], THEME.focus if is_sel else 0))
+                lines.append((boxed_line(f"│  {value}", width), 0))
                 if is_sel:
-                    top_line = "┌─» " + label + " «" + "─" * max(0, box_w - len(label) - 7) + "┐"
+                    lines.append((filler, 0))
                 else:
-                    top_line = "┌─ " + label + " " + "─" * max(0, box_w - len(label) - 5) + "┐"
-                try:
-                    win.addnstr(current_y, 0, top_line[: box_w], box_w)
-                except curses.error:
-                    pass
-                
-                # Content line
-                content = f"│ {value}" + " " * max(0, box_w - len(value) - 3) + "│"
-                try:
-                    win.addnstr(current_y + 1, 0, content[: box_w], box_w)
-                except curses.error:
-                    pass
-                
-                # Bottom border
-                bottom_line = "└" + "─" * (box_w - 2) + "┘"
-                try:
-                    win.addnstr(current_y + 2, 0, bottom_line[: box_w], box_w)
-                except curses.error:
-                    pass
-                
-                current_y += box_h
-            
-            win.noutrefresh()
-        except curses.error:
-            pass
+                    lines.append((self._tpl["tags_dots"], THEME.dim))
+        else:
+            lines.append((boxed_line("│ Open a file to edit tags", width), THEME.dim))
+        lines.extend([(filler, 0)] * (height - len(lines)))
+        return lines[:height]
 
     def prompt_input(self, prompt: str, initial: str = "") -> Optional[str]:
-        h, w = self.stdscr.getmaxyx()
+        h, w = self._size
         win_h = 3
         win_w = min(max(30, len(prompt) + 10), w - 4)
         win_y = h // 2 - win_h // 2
         win_x = w // 2 - win_w // 2
         win = curses.newwin(win_h, win_w, win_y, win_x)
         win.keypad(True)
+        # Static chrome: drawn once, only the field row changes per keystroke
         win.box()
+        win.addnstr(0, 2, f" {prompt.strip()} ", win_w - 4)
+        field_w = win_w - 4
+        blank = " " * field_w
         curses.curs_set(1)
-        buffer = list(initial)
-        pos = len(buffer)
-        while True:
-            # Render
-            win.erase()
-            win.box()
-            win.addnstr(0, 2, f" {prompt.strip()} ", win_w - 4)
-            visible = "".join(buffer)
-            field_w = win_w - 4
-            # Calculate display position accounting for wide chars
-            display_text = visible
-            if len(display_text) > field_w - 1:
-                # Simple truncation for now
-                start = max(0, len(display_text) - field_w + 1)
-                display_text = display_text[start:]
-            win.addnstr(1, 2, " " * (field_w), field_w)
-            try:
-                win.addstr(1, 2, display_text[: field_w - 1])
-            except curses.error:
-                pass
-            # Place cursor at end
-            try:
-                cursor_pos = min(len(display_text), field_w - 1)
-                win.move(1, 2 + cursor_pos)
-            except curses.error:
-                pass
-            win.refresh()
+        # Gap buffer split at the cursor: left holds the text before it,
+        # right the text after it in reverse order, so typing, deleting and
+        # moving the cursor only push and pop at list ends
+        left = list(initial)
+        right: List[str] = []
 
-            # Use get_wch for proper unicode support
-            try:
-                ch = win.get_wch()
-            except curses.error:
-                continue
-            
-            # Handle special keys (returned as integers)
-            if isinstance(ch, int):
-                if ch in (curses.KEY_ENTER, 10, 13):
-                    curses.curs_set(0)
-                    return "".join(buffer)
-                elif ch == 27:  # ESC
-                    curses.curs_set(0)
-                    return None
-                elif ch == curses.KEY_LEFT:
-                    if pos > 0:
-                        pos -= 1
-                elif ch == curses.KEY_RIGHT:
-                    if pos < len(buffer):
-                        pos += 1
-                elif ch in (curses.KEY_BACKSPACE, 127, 8):
-                    if pos > 0:
-                        buffer.pop(pos - 1)
-                        pos -= 1
-                elif ch == curses.KEY_DC:  # Delete
-                    if pos < len(buffer):
-                        buffer.pop(pos)
-                elif ch == curses.KEY_HOME:
-                    pos = 0
-                elif ch == curses.KEY_END:
-                    pos = len(buffer)
-            # Handle regular characters (returned as strings)
-            elif isinstance(ch, str):
-                if ch == '\n' or ch == '\r':
-                    curses.curs_set(0)
-                    return "".join(buffer)
-                elif ch == '\x1b':  # ESC
-                    curses.curs_set(0)
-                    return None
-                elif ch == '\x7f' or ch == '\b':  # Backspace
-                    if pos > 0:
-                        buffer.pop(pos - 1)
-                        pos -= 1
-                elif ch.isprintable():
-                    buffer.insert(pos, ch)
-                    pos += 1
+        def text() -> str:
+            return "".join(left) + "".join(reversed(right))
 
-    def file_picker(self, title: str, exts: set) -> Optional[str]:
-        # Modal file picker constrained to exts
-        h, w = self.stdscr.getmaxyx()
-        win_h = max(12, min(30, h - 4))
-        win_w = max(40, min(100, w - 4))
-        y = h // 2 - win_h // 2
-        x = w // 2 - win_w // 2
-        win = curses.newwin(win_h, win_w, y, x)
-        win.keypad(True)
-        browser = FileBrowser(self.browser.root, exts)
-        while True:
-            win.erase()
-            win.box()
-            header = f" {title} "
-            path_line = browser.root
-            try:
-                win.addnstr(0, 2, header[: win_w - 4], win_w - 4)
-                win.addnstr(1, 2, path_line[: win_w - 4], win_w - 4, curses.A_BOLD)
-            except curses.error:
-                pass
-            # entries
-            max_rows = win_h - 5
-            start = 0
-            if browser.selection >= max_rows:
-                start = browser.selection - max_rows + 1
-            for i in range(start, min(len(browser.entries), start + max_rows)):
-                name = browser.entries[i]
-                attr = curses.A_REVERSE if i == browser.selection else 0
+        panel = curses.panel.new_panel(win)
+        try:
+            while True:
+                # Render
+                visible = text()
+                # Calculate display position accounting for wide chars
+                display_text = visible
+                if len(display_text) > field_w - 1:
+                    # Simple truncation for now
+                    start = max(0, len(display_text) - field_w + 1)
+                    display_text = display_text[start:]
+                # Blank the field without touching the side borders
+                win.addnstr(1, 2, blank, field_w)
                 try:
-                    win.addnstr(2 + i - start, 2, name[: win_w - 4], win_w - 4, attr)
+                    win.addstr(1, 2, display_text[: field_w - 1])
                 except curses.error:
                     pass
-            # footer/help
-            help_line = "Enter: open/select  Backspace: up  ESC: cancel"
-            try:
-                win.addnstr(win_h - 2, 2, help_line[: win_w - 4], win_w - 4, curses.A_DIM)
-            except curses.error:
-                pass
-            win.refresh()
-
-            ch = win.getch()
-            if ch in (27,):
-                return None
-            elif ch == curses.KEY_UP:
-                browser.up()
-            elif ch == curses.KEY_DOWN:
-                browser.down()
-            elif ch in (curses.KEY_BACKSPACE, 127, 8):
-                browser.parent()
-            elif ch in (curses.KEY_ENTER, 10, 13):
-                # Enter: enter dir or select file
-                name = browser.entries[browser.selection] if browser.entries else None
-                if not name:
-                    continue
-                if name.endswith('/'):
-                    browser.enter()
-                else:
-                    return os.path.join(browser.root, name)
+                # Place cursor at end
+                try:
+                    cursor_pos = min(len(display_text), field_w - 1)
+                    win.move(1, 2 + cursor_pos)
+                except curses.error:
+                    pass
+                curses.panel.update_panels()
+                curses.doupdate()
+
+                # Use get_wch for proper unicode support; a paste arrives as
+                # a burst of characters and is applied before the next render
+                for ch in self._read_keys(win, wide=True):
+                    # Handle special keys (returned as integers)
+                    if isinstance(ch, int):
+                        if ch in KEYS_ENTER:
+                            curses.curs_set(0)
+                            return text()
+                        elif ch == KEY_ESC:
+                            curses.curs_set(0)
+                            return None
+                        elif ch == curses.KEY_LEFT:
+                            if left:
+                                right.append(left.pop())
+                        elif ch == curses.KEY_RIGHT:
+                            if right:
+                                left.append(right.pop())
+                        elif ch in KEYS_BACKSPACE:
+                            if left:
+                                left.pop()
+                        elif ch == curses.KEY_DC:  # Delete
+                            if right:
+                                right.pop()
+                        elif ch == curses.KEY_RESIZE:
+                            # The prompt stays where it is, the screen
+                            # behind it is laid out again once it closes
+                            self.resize()
+                        elif ch == curses.KEY_HOME:
+                            right.extend(reversed(left))
+                            left.clear()
+                        elif ch == curses.KEY_END:
+                            left.extend(reversed(right))
+                            right.clear()
+                    # Handle regular characters (returned as strings)
+                    elif isinstance(ch, str):
+                        if ch == '\n' or ch == '\r':
+                            curses.curs_set(0)
+                            return text()
+                        elif ch == '\x1b':  # ESC
+                            curses.curs_set(0)
+                            return None
+                        elif ch == '\x7f' or ch == '\b':  # Backspace
+                            if left:
+                                left.pop()
+                        elif ch.isprintable():
+                            left.append(ch)
+        finally:
+            self.close_modal(panel)
+
+    def file_picker(self, title: str, exts: set) -> Optional[str]:
+        # Modal file picker constrained to exts
+        browser = FileBrowser(self.browser.root, exts)
+        panel = None
+        try:
+            win = None
+            while True:
+                if win is None:
+                    # (Re)build the window for the current screen size
+                    h, w = self._size
+                    win_h = max(12, min(30, h - 4))
+                    win_w = max(40, min(100, w - 4))
+                    y = h // 2 - win_h // 2
+                    x = w // 2 - win_w // 2
+                    win = curses.newwin(win_h, win_w, y, x)
+                    win.keypad(True)
+                    panel = curses.panel.new_panel(win)
+                    max_rows = win_h - 5
+                    field_w = win_w - 4
+                    blank = " " * field_w
+                    # Border, title and help line never change for this window
+                    win.box()
+                    header = f" {title} "
+                    help_line = "Enter: open/select  Backspace: up  ESC: cancel"
+                    try:
+                        win.addnstr(0, 2, header[: win_w - 4], win_w - 4)
+                        win.addnstr(win_h - 2, 2, help_line[: win_w - 4], win_w - 4, THEME.dim)
+                    except curses.error:
+                        pass
+                    # A stretch of the listing around the selection lives in
+                    # a pad; scrolling within it only moves the part that is
+                    # shown, leaving it renders the stretch around the view
+                    pad_rows = max(PICKER_PAD_ROWS, max_rows)
+                    pad = curses.newpad(pad_rows, field_w)
+                    pad_of = None
+                    pad_top = 0
+                    marked = 0
+                    # Path row text on screen
+                    shown_path = None
+                start = max(0, browser.selection - max_rows + 1)
+                if (pad_of is not browser.entries or start < pad_top
+                        or start + max_rows > pad_top + pad_rows):
+                    # New listing or the view left the rendered stretch:
+                    # render the rows around the view. The pad is not a
+                    # panel, so let the window blank the rows it leaves free
+                    pad_of = browser.entries
+                    pad_top = max(0, min(start - (pad_rows - max_rows) // 2,
+                                         len(pad_of) - pad_rows))
+                    pad.erase()
+                    for row, name in enumerate(pad_of[pad_top:pad_top + pad_rows]):
+                        self.put(pad, row, 0, name, field_w)
+                    marked = browser.selection
+                    if pad_of:
+                        self.put(pad, marked - pad_top, 0, pad_of[marked], field_w,
+                                 curses.A_REVERSE)
+                    win.touchwin()
+                elif marked != browser.selection:
+                    # Only the highlight moved
+                    self.put(pad, marked - pad_top, 0, pad_of[marked], field_w)
+                    marked = browser.selection
+                    self.put(pad, marked - pad_top, 0, pad_of[marked], field_w,
+                             curses.A_REVERSE)
+                if shown_path != browser.root:
+                    self.put(win, 1, 2, blank, field_w)
+                    self.put(win, 1, 2, browser.root, field_w, THEME.panel_title)
+                    shown_path = browser.root
+                # Stage and flush explicitly: the window is then untouched, so
+                # the implicit refresh in getch() has nothing left to do
+                curses.panel.update_panels()
+                rows = min(max_rows, len(pad_of) - start)
+                if rows > 0:
+                    pad.noutrefresh(start - pad_top, 0, y + 2, x + 2, y + 1 + rows, x + 1 + field_w)
+                curses.doupdate()
+
+                resized = False
+                for ch in self._read_keys(win):
+                    if ch == KEY_ESC:
+                        return None
+                    elif ch == curses.KEY_RESIZE:
+                        resized = True
+                        break
+                    elif ch == curses.KEY_UP:
+                        browser.up()
+                    elif ch == curses.KEY_DOWN:
+                        browser.down()
+                    elif ch in KEYS_BACKSPACE:
+                        browser.parent()
+                    elif ch in KEYS_ENTER:
+                        # Enter: enter dir or select file
+                        picked = browser.enter()
+                        if picked:
+                            return picked
+                if resized:
+                    # Lay out the main screen for the new size, then put the
+                    # picker back on top of it
+                    self.resize()
+                    panel.hide()
+                    self.flush_dirty()
+                    win = panel = None
+        finally:
+            if panel is not None:
+                self.close_modal(panel)
 
     def help(self):
-        h, w = self.stdscr.getmaxyx()
-        text = [
-            "ytx-tag help",
-            "",
-            "Navigation:",
-            "  ↑/↓        Move in file list or fields",
-            "  ←/→, Tab   Switch between files and tags panes",
-            "  Enter      Open dir/file (left) or edit field (right)",
-            "  Backspace  Up to parent dir",
-            "  o          Open music file via modal picker",
-            "",
-            "Editing:",
-            "  s          Save tags",
-            "  r          Reload tags from file",
-            "  c / C      Set cover (choose image) / Clear cover",
-            "",
-            "File picker (modal):",
-            "  ↑/↓        Move",
-            "  Enter      Enter directory / select file",
-            "  Backspace  Go to parent directory",
-            "  ESC        Cancel",
-            "",
-            "Other:",
-            "  q          Quit",
-            "  h or ?     Show this help",
-        ]
-        win_h = min(len(text) + 4, max(10, h - 4))
-        win_w = min(max(len(max(text, key=len)) + 4, 40), w - 4)
+        h, w = self._size
+        win_h = min(len(HELP_TEXT) + 4, max(10, h - 4))
+        win_w = min(max(HELP_MAXLEN + 4, 40), w - 4)
         y = h // 2 - win_h // 2
         x = w // 2 - win_w // 2
         win = curses.newwin(win_h, win_w, y, x)
         win.box()
-        for i, line in enumerate(text[: win_h - 2]):
-            win.addnstr(1 + i, 2, line[: win_w - 4], win_w - 4)
-        win.addnstr(win_h - 1, 2, "Press any key to close", win_w - 4, curses.A_DIM)
-        win.refresh()
-        win.getch()
+        # addnstr already cuts each line to the window width
+        for i, line in enumerate(HELP_TEXT[: win_h - 2]):
+            win.addnstr(1 + i, 2, line, win_w - 4, THEME.help)
+        win.addnstr(win_h - 1, 2, "Press any key to close", win_w - 4, THEME.dim)
+        panel = curses.panel.new_panel(win)
+        try:
+            curses.panel.update_panels()
+            curses.doupdate()
+            if win.getch() == curses.KEY_RESIZE:
+                self.resize()
+        finally:
+            self.close_modal(panel)
+
+    def _read_keys(self, win, wide: bool = False):
+        """Wait for a key, then yield it and every key already queued.
+
+        Callers apply the whole batch (a held arrow key, a paste) and draw
+        once for it instead of once per key. wide reads with get_wch() for
+        text input.
+        """
+        read = win.get_wch if wide else win.getch
+        try:
+            ch = read()
+        except curses.error:
+            return
+        win.nodelay(True)
+        try:
+            while ch != -1:
+                yield ch
+                try:
+                    ch = read()
+                except curses.error:
+                    # get_wch() with nothing queued
+                    return
+        finally:
+            win.nodelay(False)
 
     def loop(self):
         curses.curs_set(0)
         self.draw()
-        while True:
-            try:
-                ch = self.stdscr.getch()
-            except KeyboardInterrupt:
-                break
-
-            # Global hotkeys
-            if ch in (ord('o'),):
-                # modal open music file
-                picked = self.file_picker("Open music file", SUPPORTED_EXTS)
-                if picked:
-                    self.current_path = picked
-                    # sync browser to the file's directory
-                    self.browser.root = os.path.dirname(picked)
-                    self.browser.refresh()
-                    # set selection to file
-                    base = os.path.basename(picked)
-                    if base in self.browser.entries:
-                        self.browser.selection = self.browser.entries.index(base)
-                    self.load_current()
-                    self.focus = 'tags'
-                    self.draw()
-                continue
-
-            if ch in (ord('q'), ord('Q')):
-                if self.dirty:
-                    # Confirm discard
-                    ans = self.prompt_input("Unsaved changes, type 'yes' to quit: ", "")
-                    if ans != 'yes':
-                        self.draw()
-                        continue
-                break
-
-            if ch in (ord('h'), ord('?')):
-                self.help()
-                self.draw()
-                continue
-
-            # Navigation keys
-            if ch == curses.KEY_UP:
-                if self.focus == "browser":
-                    self.browser.up()
-                    self.draw()
-                elif self.focus == "tags":
-                    self.cursor_field = (self.cursor_field - 1) % len(DEFAULT_FIELDS)
-                    self.draw()
-            elif ch == curses.KEY_DOWN:
-                if self.focus == "browser":
-                    self.browser.down()
-                    self.draw()
-                elif self.focus == "tags":
-                    self.cursor_field = (self.cursor_field + 1) % len(DEFAULT_FIELDS)
-                    self.draw()
-            elif ch in (curses.KEY_BACKSPACE, 127, 8):
-                if self.focus == "browser":
-                    self.browser.parent()
-                    self.current_path = None
-                    self.load_current()
-                    self.draw()
-            
-            # Enter key
-            elif ch in (curses.KEY_ENTER, 10, 13, ord('e')):
-                if self.focus == "browser":
-                    path = self.browser.enter()
-                    if path:
-                        self.current_path = path
-                        self.load_current()
-                        self.focus = "tags"  # switch to tags after opening file
-                    self.draw()
-                elif self.focus == "tags":
-                    self.edit_field(self.cursor_field)
-                    self.draw()
-            
-            # Tab to switch panels
-            elif ch in (9, curses.KEY_BTAB):
-                # Cycle: browser -> tags -> browser
-                if self.focus == "browser":
-                    self.focus = "tags"
-                elif self.focus == "tags":
-                    self.focus = "browser"
-                self.draw()
-            
-            # Tag editing shortcuts (work in any panel if file selected)
-            elif ch in (ord('s'), ord('S')):
-                self.save_current()
-                self.draw()
-            elif ch in (ord('r'), ord('R')):
+        try:
+            while self.running:
+                for ch in self._read_keys(self.stdscr):
+                    self.handle_key(ch)
+                    if not self.running:
+                        break
+                if (self._dirty_regions or self._modal_closed) and self.running:
+                    self.flush_dirty()
+        except KeyboardInterrupt:
+            pass
+
+    def handle_key(self, ch: int):
+        """Apply one key press and mark the screen regions it changed"""
+        handler = self._handlers.get(ch)
+        if handler is not None:
+            handler()
+
+    # Global hotkeys
+    def on_open(self):
+        # modal open music file
+        picked = self.file_picker("Open music file", SUPPORTED_EXTS)
+        if picked:
+            self.current_path = picked
+            # sync browser to the file's directory, keeping the selection
+            # of the one it leaves for coming back
+            self.browser.chdir(os.path.dirname(picked))
+            # set selection to file
+            base = os.path.basename(picked)
+            if base in self.browser.entries:
+                self.browser.selection = self.browser.entries.index(base)
+            self.load_current()
+            self.focus = 'tags'
+            self.invalidate("header", "browser", "tags", "status", "cover")
+
+    def on_quit(self):
+        if self.dirty:
+            # Confirm discard
+            ans = self.prompt_input("Unsaved changes, type 'yes' to quit: ", "")
+            if ans != 'yes':
+                return
+        self.running = False
+
+    # Navigation keys
+    def on_up(self):
+        if self.focus == "browser":
+            if self.browser.up():
+                self.invalidate("browser")
+        elif self.focus == "tags":
+            self.cursor_field = (self.cursor_field - 1) % len(DEFAULT_FIELDS)
+            self.invalidate("tags")
+
+    def on_down(self):
+        if self.focus == "browser":
+            if self.browser.down():
+                self.invalidate("browser")
+        elif self.focus == "tags":
+            self.cursor_field = (self.cursor_field + 1) % len(DEFAULT_FIELDS)
+            self.invalidate("tags")
+
+    def on_back(self):
+        if self.focus == "browser" and self.browser.parent():
+            self.current_path = None
+            self.load_current()
+            self.invalidate("header", "browser", "tags", "status", "cover")
+
+    def on_enter(self):
+        if self.focus == "browser":
+            if not self.browser.entries:
+                return
+            path = self.browser.enter()
+            if path:
+                self.current_path = path
                 self.load_current()
-                self.draw()
-            elif ch == ord('C'):
-                if self.current_path:
-                    io = TagIO(self.current_path)
-                    ok, err = io.clear_cover()
-                    if ok:
-                        self.status_msg = "Cover cleared"
-                    else:
-                        self.status_msg = f"Cover clear failed: {err}"
-                    self.cover_info = io.get_cover_info()
-                    self.draw()
-            elif ch in (ord('c'),):
-                # choose image and set as cover
-                img = self.file_picker("Select image for cover", IMAGE_EXTS)
-                if img and self.current_path:
-                    io = TagIO(self.current_path)
-                    ok, err = io.set_cover(img)
-                    if ok:
-                        self.status_msg = "Cover set"
-                    else:
-                        self.status_msg = f"Cover set failed: {err}"
-                    self.cover_info = io.get_cover_info()
-                    self.draw()
-            
+                self.focus = "tags"  # switch to tags after opening file
+            self.invalidate("header", "browser", "tags", "status", "cover")
+        elif self.focus == "tags":
+            self.edit_field(self.cursor_field)
+            self.invalidate("header", "tags")
+
+    def on_tab(self):
+        # Cycle: browser -> tags -> browser
+        if self.focus == "browser":
+            self.focus = "tags"
+        elif self.focus == "tags":
+            self.focus = "browser"
+        # Both panels show or hide their selection marker
+        self.invalidate("browser", "tags")
+
+    # Tag editing shortcuts (work in any panel if file selected)
+    def on_save(self):
+        if self.current_path is None:
+            return
+        self.save_current()
+        self.invalidate("header", "status")
+
+    def on_reload(self):
+        self.load_current()
+        self.invalidate("header", "tags", "status", "cover")
+
+    def on_clear_cover(self):
+        if self.current_path:
+            ok, err = self.get_io().clear_cover()
+            if ok:
+                self.status_msg = "Cover cleared"
+            else:
+                self.status_msg = f"Cover clear failed: {err}"
+            # The file changed on disk; TagIO already re-read its stale parts
+            self.tag_cache.invalidate(self.current_path)
+            self.cover_info = self.get_io().get_cover_info()
+            self.invalidate("status", "cover")
+
+    def on_set_cover(self):
+        # choose image and set as cover
+        img = self.file_picker("Select image for cover", IMAGE_EXTS)
+        if img and self.current_path:
+            ok, err = self.get_io().set_cover(img)
+            if ok:
+                self.status_msg = "Cover set"
+            else:
+                self.status_msg = f"Cover set failed: {err}"
+            # The file changed on disk; TagIO already re-read its stale parts
+            self.tag_cache.invalidate(self.current_path)
+            self.cover_info = self.get_io().get_cover_info()
+            self.invalidate("status", "cover")
+
 
 # ---- Theming ----
-class Theme:
-    def __init__(self):
-        self.color_header = curses.color_pair(1) | curses.A_BOLD
-        self.color_status = curses.color_pair(2)
-        self.color_help = curses.color_pair(3)
-        self.color_panel_title = curses.color_pair(4) | curses.A_BOLD
-        self.color_focus = curses.color_pair(5)
-        self.color_dim = curses.A_DIM
+# Attributes for each screen element, filled in once by init_colors(); plain
+# values so drawing code reads them without any color_pair() call. Without
+# color support they fall back to bold and dim.
+THEME = SimpleNamespace(header=0, status=0, help=0, panel_title=0, focus=0, dim=0)
 
 
 def init_colors():
+    THEME.header = THEME.panel_title = THEME.focus = curses.A_BOLD
+    THEME.dim = curses.A_DIM
     if not curses.has_colors():
         return
     curses.start_color()
@@ -1051,15 +1407,31 @@ def init_colors():
     curses.init_pair(3, curses.COLOR_CYAN, -1)                     # help text
     curses.init_pair(4, curses.COLOR_YELLOW, -1)                   # panel title
     curses.init_pair(5, curses.COLOR_BLACK, curses.COLOR_YELLOW)   # selection focus
+    THEME.header = curses.color_pair(1) | curses.A_BOLD
+    THEME.status = curses.color_pair(2)
+    THEME.help = curses.color_pair(3)
+    THEME.panel_title = curses.color_pair(4) | curses.A_BOLD
+    THEME.focus = curses.color_pair(5) | curses.A_BOLD
 
 
 def main(stdscr, start_path: str):
     init_colors()
     stdscr.keypad(True)
+    if getattr(curses, "ncurses_version", (0, 0))[:2] == (6, 4):
+        # ncurses 6.4 (measured with 6.4.20221231) flushes its output after
+        # every cursor movement until the first endwin(): the start screen
+        # took about 100 write() calls and each later frame one per changed
+        # run of cells. One suspend/resume before the first frame brings that
+        # to 8 writes at start and one per frame, at the cost of a brief
+        # switch out of the alternate screen. Other versions are left alone.
+        curses.endwin()
+        stdscr.refresh()
     app = Tui(stdscr, start_path)
-    app.theme = Theme()
     app.draw()
-    app.loop()
+    try:
+        app.loop()
+    finally:
+        app.tag_cache.save()
 
 
 if __name__ == "__main__":